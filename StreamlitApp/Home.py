@@ -1,8 +1,10 @@
 import streamlit as st
-from PIL import Image
 import os
 import base64
 
+from session_store import track_session
+from tracing import span, start_page_run, finish_page_run
+
 # -------------------------------
 # Page Configuration
 # -------------------------------
@@ -12,6 +14,11 @@ st.set_page_config(
     layout="wide",
 )
 
+# -------------------------------
+# Tracing & Profiling
+# -------------------------------
+run_started = start_page_run()
+
 # -------------------------------
 # Local Background Image (Base64 Method)
 # -------------------------------
@@ -24,7 +31,8 @@ def get_base64_of_bin_file(bin_file):
     return base64.b64encode(data).decode()
 
 if os.path.exists(bg_image_path):
-    bin_str = get_base64_of_bin_file(bg_image_path)
+    with span("home.background_b64"):
+        bin_str = get_base64_of_bin_file(bg_image_path)
     page_bg = f"""
     <style>
     [data-testid="stAppViewContainer"] {{
@@ -135,3 +143,9 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+# -------------------------------
+# Tracing & Profiling
+# -------------------------------
+finish_page_run("home", run_started)
+track_session("home")
@@ -0,0 +1,79 @@
+import json
+import os
+
+import numpy as np
+
+CALIBRATION_PATH = "Models/calibration.json"
+
+
+def load_calibration(path=CALIBRATION_PATH):
+    """Load the per-model calibration tables written by the training notebook"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def applied_tables(calibration):
+    """Tables the notebook kept; a calibrator that did not lower held-out ECE is recorded but not applied"""
+    return {name: table for name, table in calibration.items() if table.get("applied", True)}
+
+
+def apply_calibration(p, table):
+    """Map raw probabilities through a monotone lookup table"""
+    return np.interp(p, table["x"], table["y"])
+
+
+def reliability_bins(y_true, y_prob, n_bins=10):
+    """Mean predicted probability, observed positive rate and count per probability bin"""
+    y_true = np.asarray(y_true, dtype=float)
+    y_prob = np.asarray(y_prob, dtype=float)
+    idx = np.minimum((y_prob * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(idx, minlength=n_bins)
+    pred_sum = np.bincount(idx, weights=y_prob, minlength=n_bins)
+    true_sum = np.bincount(idx, weights=y_true, minlength=n_bins)
+    nonempty = counts > 0
+    mean_pred = np.divide(pred_sum, counts, out=np.zeros(n_bins), where=nonempty)
+    frac_pos = np.divide(true_sum, counts, out=np.zeros(n_bins), where=nonempty)
+    return mean_pred, frac_pos, counts
+
+
+def expected_calibration_error(y_true, y_prob, n_bins=10):
+    """Count-weighted gap between confidence and accuracy across probability bins"""
+    mean_pred, frac_pos, counts = reliability_bins(y_true, y_prob, n_bins)
+    return float(np.sum(counts * np.abs(mean_pred - frac_pos)) / max(counts.sum(), 1))
+
+
+class CalibratedClassifier:
+    """Wraps a fitted classifier so predict_proba returns calibrated probabilities"""
+
+    def __init__(self, model, table, positive_class="CONFIRMED"):
+        self.model = model
+        self.table = table
+        classes = list(model.classes_)
+        # The table maps P(positive_class); predict_proba keeps the wrapped model's column order
+        self.positive_index = classes.index(positive_class) if positive_class in classes else len(classes) - 1
+        self.classes_ = model.classes_
+        for attr in ("feature_names_", "feature_name_"):
+            if hasattr(model, attr):
+                setattr(self, attr, getattr(model, attr))
+
+    def predict_proba(self, X_df):
+        p = apply_calibration(self.model.predict_proba(X_df)[:, self.positive_index], self.table)
+        probs = np.empty((len(p), 2))
+        probs[:, self.positive_index] = p
+        probs[:, 1 - self.positive_index] = 1.0 - p
+        return probs
+
+    def predict(self, X_df):
+        p = self.predict_proba(X_df)[:, self.positive_index]
+        return np.where(p >= 0.5, self.classes_[self.positive_index], self.classes_[1 - self.positive_index])
+
+
+def calibrate_models(models, calibration):
+    """Wrap every model whose calibration table is applied, leaving the rest untouched"""
+    calibration = applied_tables(calibration)
+    return {
+        name: CalibratedClassifier(model, calibration[name]) if name in calibration else model
+        for name, model in models.items()
+    }
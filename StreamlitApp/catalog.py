@@ -0,0 +1,130 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# -------------------------------
+# Precomputed catalog scores.
+#
+# `exoboost build-catalog` scores every catalog row with each production model
+# once and stores the probabilities next to the identifiers in an indexed
+# SQLite table. The Catalog page then filters, sorts and pages through it with
+# SQL, so a page request only ever moves one page of rows.
+# -------------------------------
+
+CATALOG_DB_PATH = "Models/catalog_scores.sqlite"
+
+# Stored next to the scores: identifiers, NASA's own disposition score and a few catalog values
+COLUMNS = {
+    "kepoi_name": "TEXT",
+    "kepid": "INTEGER",
+    "kepler_name": "TEXT",
+    "mission": "TEXT",
+    "disposition": "TEXT",
+    "koi_score": "REAL",
+    "koi_period": "REAL",
+    "koi_prad": "REAL",
+    "koi_teq": "REAL",
+    "koi_steff": "REAL",
+}
+
+
+def score_column(model_name):
+    """SQL column holding one model's CONFIRMED probability, e.g. p_catboost"""
+    return "p_" + re.sub(r"[^a-z0-9]+", "_", model_name.lower()).strip("_")
+
+
+def build_catalog_db(chunks, model_names, path=CATALOG_DB_PATH, sources=None):
+    """Write scored chunks (COLUMNS plus one score column per model) to a fresh database.
+
+    The file is built next to `path` and swapped in at the end, so readers never see a partial table.
+    """
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    columns = [score_column(name) for name in model_names]
+    schema = {**COLUMNS, **{c: "REAL" for c in columns}}
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute(f"CREATE TABLE scores ({', '.join(f'{c} {t}' for c, t in schema.items())})")
+        order = list(schema)
+        placeholders = ", ".join("?" for _ in order)
+        rows = 0
+        for chunk in chunks:
+            data = chunk[order].astype(object).where(chunk[order].notna(), None)
+            conn.executemany(
+                f"INSERT INTO scores ({', '.join(order)}) VALUES ({placeholders})",
+                data.itertuples(index=False, name=None),
+            )
+            rows += len(chunk)
+
+        # Identifier lookups, plus (disposition, score) pairs for the "top CANDIDATEs" query
+        conn.execute("CREATE INDEX idx_kepoi_name ON scores (kepoi_name)")
+        conn.execute("CREATE INDEX idx_kepid ON scores (kepid)")
+        for c in columns:
+            conn.execute(f"CREATE INDEX idx_{c} ON scores ({c})")
+            conn.execute(f"CREATE INDEX idx_disposition_{c} ON scores (disposition, {c})")
+
+        conn.execute("CREATE TABLE models (name TEXT, score_column TEXT, version TEXT)")
+        conn.executemany(
+            "INSERT INTO models VALUES (?, ?, ?)",
+            [(name, score_column(name), (sources or {}).get(name, "")) for name in model_names],
+        )
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT INTO meta VALUES ('built_at', ?)", (time.strftime("%Y-%m-%d %H:%M:%S"),))
+        conn.execute("INSERT INTO meta VALUES ('rows', ?)", (str(rows),))
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    return rows
+
+
+class CatalogReader:
+    """Read-only, thread-safe query access to the catalog database, shared by every session"""
+
+    def __init__(self, path=CATALOG_DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.models = dict(self._query("SELECT name, score_column FROM models").itertuples(index=False))
+        self.meta = dict(self._query("SELECT key, value FROM meta").itertuples(index=False))
+        self.dispositions = self._query(
+            "SELECT DISTINCT disposition FROM scores WHERE disposition IS NOT NULL ORDER BY disposition"
+        )["disposition"].tolist()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def columns(self):
+        return list(COLUMNS) + list(self.models.values())
+
+    def page(self, model, dispositions=None, min_prob=0.0, search="", sort=None, descending=True,
+             limit=50, offset=0):
+        """One page of rows matching the filters, plus the total number of matches"""
+        score = self.models[model]
+        sort = sort if sort in self.columns() else score  # column names never come from user text
+
+        where, params = [f"{score} >= ?"], [float(min_prob)]
+        if dispositions:
+            where.append(f"disposition IN ({', '.join('?' for _ in dispositions)})")
+            params += list(dispositions)
+        if search:
+            where.append("(kepoi_name LIKE ? OR kepler_name LIKE ? OR CAST(kepid AS TEXT) = ?)")
+            params += [f"%{search}%", f"%{search}%", search]
+        clause = " AND ".join(where)
+
+        total = int(self._query(f"SELECT COUNT(*) AS n FROM scores WHERE {clause}", params)["n"][0])
+        # rowid breaks ties in the same direction, which is the order the indexes already store
+        direction = "DESC" if descending else "ASC"
+        rows = self._query(
+            f"SELECT * FROM scores WHERE {clause} ORDER BY {sort} {direction}, rowid {direction} LIMIT ? OFFSET ?",
+            params + [int(limit), int(offset)],
+        )
+        return rows, total
@@ -0,0 +1,76 @@
+import argparse
+import filecmp
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+# -------------------------------
+# Resume check for `exoboost score --resume` (a development script, not part of the CLI).
+#
+# Scores the input straight through, then again with the run SIGKILLed (pool
+# workers included, so nothing gets to clean up) once it has checkpointed some
+# rows, resumes it, and fails unless both outputs are byte-identical.
+#
+# Usage (from the repository root):
+#   python StreamlitApp/dev/check_resume.py nasa_archive_download.csv
+#   python StreamlitApp/dev/check_resume.py Dataset/cumulative.csv --model "Ensemble (CatBoost + LightGBM)" --samples 20
+# -------------------------------
+
+EXOBOOST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exoboost.py")
+
+
+def check_resume(input_path, model="CatBoost", chunksize=500, workers=2, samples=0, kill_after=1):
+    """True if an interrupted, resumed run writes the same bytes as an uninterrupted one"""
+    score = [sys.executable, EXOBOOST, "score", input_path]
+    options = ["--model", model, "--chunksize", str(chunksize), "--workers", str(workers)]
+    if samples:
+        options += ["--samples", str(samples)]
+    with tempfile.TemporaryDirectory() as tmp:
+        straight, resumed = os.path.join(tmp, "straight.csv"), os.path.join(tmp, "resumed.csv")
+        subprocess.run(score + [straight] + options, check=True, stderr=subprocess.DEVNULL)
+
+        # Own process group, so the kill reaches the pool workers too
+        run = subprocess.Popen(score + [resumed] + options, stderr=subprocess.DEVNULL, start_new_session=True)
+        rows_done = 0
+        while run.poll() is None and rows_done < kill_after:
+            time.sleep(0.02)
+            try:
+                with open(resumed + ".progress") as f:
+                    rows_done = json.load(f)["rows_done"]
+            except (OSError, ValueError):
+                pass
+        if run.poll() is not None:
+            raise SystemExit("The run finished before it could be interrupted; lower --chunksize or --kill-after.")
+        os.killpg(run.pid, signal.SIGKILL)
+        run.wait()
+        print(f"Interrupted after {rows_done} checkpointed rows "
+              f"({os.path.getsize(resumed)} bytes on disk); resuming", file=sys.stderr)
+        subprocess.run(score + [resumed] + options + ["--resume"], check=True, stderr=subprocess.DEVNULL)
+
+        same = filecmp.cmp(straight, resumed, shallow=False)
+        print(f"{'OK' if same else 'FAIL'}: resumed output {'matches' if same else 'differs from'} "
+              f"the uninterrupted run ({os.path.getsize(straight)} bytes)", file=sys.stderr)
+        return same
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that an interrupted, resumed `exoboost score` run "
+                                                 "writes the same bytes as an uninterrupted one.")
+    parser.add_argument("input", help="catalog to score, e.g. a NASA archive download with its # preamble")
+    parser.add_argument("--model", default="CatBoost")
+    parser.add_argument("--chunksize", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=0, help="also check --samples mode")
+    parser.add_argument("--kill-after", type=int, default=1,
+                        help="interrupt once at least this many rows are checkpointed")
+    args = parser.parse_args(argv)
+    ok = check_resume(args.input, args.model, args.chunksize, args.workers, args.samples, args.kill_after)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import os
+
+import numpy as np
+
+DRIFT_REFERENCE_PATH = "Models/drift_reference.json"
+
+# PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 significant shift
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+
+_EPS = 1e-6
+_EDGE_TOL = 1e-9
+
+
+def load_reference(path=DRIFT_REFERENCE_PATH):
+    """Training-set bin edges and counts written by the training notebook"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def psi(expected, actual):
+    """Population Stability Index between two binned distributions"""
+    e = np.asarray(expected, dtype=float)
+    a = np.asarray(actual, dtype=float)
+    e = e / max(e.sum(), 1) + _EPS
+    a = a / max(a.sum(), 1) + _EPS
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks(expected, actual):
+    """Kolmogorov-Smirnov statistic evaluated on the shared bin edges"""
+    e = np.cumsum(expected) / max(np.sum(expected), 1)
+    a = np.cumsum(actual) / max(np.sum(actual), 1)
+    return float(np.max(np.abs(a - e)))
+
+
+class DriftMonitor:
+    """Streaming per-feature and prediction histograms over the training reference bins.
+
+    Each update costs one searchsorted + bincount per feature, so a row is O(1)
+    regardless of how much has been scored before, and reports never reread data.
+    """
+
+    def __init__(self, reference, model_name):
+        self.features = reference["features"]
+        # Many training values sit exactly on an edge (the IQR clip bounds); the small
+        # tolerance keeps values that lost an ulp in a CSV round trip in the same bin
+        self.edges = [np.asarray(e, dtype=float) for e in reference["edges"]]
+        self.edges = [e - _EDGE_TOL * np.maximum(1.0, np.abs(e)) for e in self.edges]
+        self.reference_counts = [np.asarray(c, dtype=np.int64) for c in reference["counts"]]
+        self.pred_edges = np.asarray(reference["prediction_edges"], dtype=float)
+        self.reference_pred = np.asarray(reference["prediction_counts"][model_name], dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.counts = [np.zeros_like(c) for c in self.reference_counts]
+        self.pred_counts = np.zeros_like(self.reference_pred)
+        self.rows = 0
+
+    def histogram(self, X, p):
+        """Bin counts for one batch (scaled features in training order, CONFIRMED probabilities)"""
+        X = np.asarray(X, dtype=float)
+        counts = [
+            np.bincount(np.searchsorted(edges, X[:, i], side="right"), minlength=len(ref))
+            for i, (edges, ref) in enumerate(zip(self.edges, self.reference_counts))
+        ]
+        pred = np.bincount(np.searchsorted(self.pred_edges, p, side="right"), minlength=len(self.reference_pred))
+        return counts, pred
+
+    def add(self, counts, pred, rows):
+        """Merge precomputed batch counts (e.g. returned by a scoring worker)"""
+        for total, c in zip(self.counts, counts):
+            total += np.asarray(c, dtype=np.int64)
+        self.pred_counts += np.asarray(pred, dtype=np.int64)
+        self.rows += rows
+
+    def update(self, X, p):
+        counts, pred = self.histogram(X, p)
+        self.add(counts, pred, len(p))
+
+    def report(self):
+        """Per-feature PSI/KS plus the shift in the prediction distribution"""
+        features = []
+        for name, ref, cur in zip(self.features, self.reference_counts, self.counts):
+            value = psi(ref, cur)
+            features.append({
+                "feature": name,
+                "psi": value,
+                "ks": ks(ref, cur),
+                "status": "alert" if value > PSI_ALERT else "warn" if value > PSI_WARN else "ok",
+            })
+        features.sort(key=lambda r: r["psi"], reverse=True)
+        centers = np.concatenate([[0.0], self.pred_edges]) + np.diff(
+            np.concatenate([[0.0], self.pred_edges, [1.0]])) / 2
+        return {
+            "rows": self.rows,
+            "features": features,
+            "prediction": {
+                "psi": psi(self.reference_pred, self.pred_counts),
+                "ks": ks(self.reference_pred, self.pred_counts),
+                "reference_mean": float(np.dot(centers, self.reference_pred) / max(self.reference_pred.sum(), 1)),
+                "current_mean": float(np.dot(centers, self.pred_counts) / max(self.pred_counts.sum(), 1)),
+            },
+        }
+
+    def state(self):
+        return {
+            "rows": self.rows,
+            "counts": [c.tolist() for c in self.counts],
+            "prediction_counts": self.pred_counts.tolist(),
+        }
+
+    def load_state(self, state):
+        self.reset()
+        self.add(state["counts"], state["prediction_counts"], state["rows"])
+
+
+def format_report(report, top=10):
+    """Plain-text drift summary for the command line"""
+    pred = report["prediction"]
+    lines = [
+        f"Drift over {report['rows']} rows (PSI > {PSI_WARN} warn, > {PSI_ALERT} alert)",
+        f"  prediction: PSI={pred['psi']:.4f} KS={pred['ks']:.4f} "
+        f"mean P(CONFIRMED) {pred['reference_mean']:.3f} -> {pred['current_mean']:.3f}",
+    ]
+    for r in report["features"][:top]:
+        lines.append(f"  {r['feature']:22s} PSI={r['psi']:.4f} KS={r['ks']:.4f} {r['status']}")
+    return "\n".join(lines)
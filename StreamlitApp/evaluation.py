@@ -0,0 +1,186 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from calibration import applied_tables, apply_calibration
+
+# -------------------------------
+# Test-set evaluation from stored probabilities.
+#
+# The training notebook saves every model's CONFIRMED probability on the test
+# split once (Models/evaluation.npz). Everything here is derived from those
+# arrays with sorts and cumulative sums, so no model is loaded or re-run.
+# -------------------------------
+
+EVALUATION_PATH = "Models/evaluation.npz"
+
+# np.trapezoid is numpy >= 2.0; older releases only have np.trapz
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def load_evaluation(path=EVALUATION_PATH):
+    """Model names, test labels (True = CONFIRMED) and an (n_models, n_test) probability matrix"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {
+            "models": [str(m) for m in data["models"]],
+            "y_true": data["y_true"].astype(bool),
+            "probs": data["prob_confirmed"].astype(np.float64),
+        }
+
+
+def threshold_counts(y_true, p):
+    """Confusion counts at every distinct score, for the rule `p >= threshold`.
+
+    Returns (thresholds descending, tp, fp); tp[i] / fp[i] count the rows with
+    p >= thresholds[i]. One sort plus two cumulative sums.
+    """
+    order = np.argsort(-p, kind="mergesort")
+    p_sorted = p[order]
+    y_sorted = y_true[order]
+    tp = np.cumsum(y_sorted)
+    fp = np.cumsum(~y_sorted)
+    # Keep the last position of each run of tied scores
+    last = np.r_[np.flatnonzero(np.diff(p_sorted)), len(p_sorted) - 1]
+    return p_sorted[last], tp[last], fp[last]
+
+
+def roc_curve(y_true, p):
+    """False/true positive rates, starting at (0, 0), and their thresholds"""
+    thresholds, tp, fp = threshold_counts(y_true, p)
+    pos, neg = max(y_true.sum(), 1), max((~y_true).sum(), 1)
+    return np.r_[0.0, fp / neg], np.r_[0.0, tp / pos], np.r_[np.inf, thresholds]
+
+
+def pr_curve(y_true, p):
+    """Precision and recall at every threshold (highest threshold first)"""
+    thresholds, tp, fp = threshold_counts(y_true, p)
+    precision = tp / (tp + fp)
+    recall = tp / max(y_true.sum(), 1)
+    return precision, recall, thresholds
+
+
+def roc_auc(y_true, p):
+    fpr, tpr, _ = roc_curve(y_true, p)
+    return float(_trapezoid(tpr, fpr))
+
+
+def average_precision(y_true, p):
+    """Area under the PR curve as a step function (sklearn's average_precision_score)"""
+    precision, recall, _ = pr_curve(y_true, p)
+    return float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+
+def confusion_matrix(y_true, p, threshold=0.5):
+    """2x2 frame, rows = actual, columns = predicted"""
+    pred = p >= threshold
+    labels = ["CANDIDATE", "CONFIRMED"]
+    counts = [
+        [int(np.sum(~y_true & ~pred)), int(np.sum(~y_true & pred))],
+        [int(np.sum(y_true & ~pred)), int(np.sum(y_true & pred))],
+    ]
+    return pd.DataFrame(counts, index=[f"actual {l}" for l in labels], columns=[f"predicted {l}" for l in labels])
+
+
+def metrics_table(evaluation, threshold=0.5):
+    """Accuracy / precision / recall / F1 at `threshold` plus ROC-AUC and PR-AUC, for every model at once"""
+    y = evaluation["y_true"]
+    pred = evaluation["probs"] >= threshold  # (n_models, n_test)
+    tp = (pred & y).sum(axis=1)
+    fp = (pred & ~y).sum(axis=1)
+    fn = (~pred & y).sum(axis=1)
+    tn = (~pred & ~y).sum(axis=1)
+    precision = np.divide(tp, tp + fp, out=np.zeros(len(tp)), where=(tp + fp) > 0)
+    recall = tp / max(y.sum(), 1)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(len(tp)),
+                   where=(precision + recall) > 0)
+    table = pd.DataFrame({
+        "Model": evaluation["models"],
+        "Accuracy": (tp + tn) / len(y),
+        "Precision": precision,
+        "Recall": recall,
+        "F1 Score": f1,
+        "ROC-AUC": [roc_auc(y, p) for p in evaluation["probs"]],
+        "PR-AUC": [average_precision(y, p) for p in evaluation["probs"]],
+    })
+    return table.sort_values("ROC-AUC", ascending=False).reset_index(drop=True)
+
+
+def app_scores(evaluation, calibration, members, ensemble_name):
+    """Test-set probabilities as the app serves them: calibrated members plus their equal-weight ensemble"""
+    scores = {}
+    calibration = applied_tables(calibration)
+    for name in members:
+        if name in evaluation["models"]:
+            p = evaluation["probs"][evaluation["models"].index(name)]
+            scores[name] = apply_calibration(p, calibration[name]) if name in calibration else p
+    if all(name in scores for name in members):
+        scores[ensemble_name] = np.mean([scores[name] for name in members], axis=0)
+    return scores
+
+
+class ThresholdSweep:
+    """Precision / recall / F1 / workload for the rule `p >= threshold`, at any threshold.
+
+    Built once from the sorted scores and a cumulative count of positives; each
+    lookup is then a single binary search, O(log n), for scalars or whole arrays.
+    """
+
+    def __init__(self, y_true, p):
+        order = np.argsort(p, kind="mergesort")
+        self.scores = np.asarray(p, dtype=float)[order]
+        self.n = len(self.scores)
+        self.positives = int(np.sum(y_true))
+        # positives_below[i]: CONFIRMED rows among the i lowest scores
+        self.positives_below = np.r_[0, np.cumsum(np.asarray(y_true, dtype=bool)[order])]
+
+    def at(self, threshold):
+        t = np.asarray(threshold, dtype=float)
+        below = np.searchsorted(self.scores, t, side="left")
+        flagged = self.n - below
+        tp = self.positives - self.positives_below[below]
+        fp = flagged - tp
+        fn = self.positives - tp
+        tn = below - fn
+        precision = np.divide(tp, flagged, out=np.zeros(t.shape), where=flagged > 0)
+        recall = tp / max(self.positives, 1)
+        f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(t.shape),
+                       where=(precision + recall) > 0)
+        result = {
+            "threshold": t,
+            "precision": precision,
+            "recall": recall,
+            "f1": f1,
+            "accuracy": (tp + tn) / max(self.n, 1),
+            "flagged": flagged,
+            "flagged_rate": flagged / max(self.n, 1),
+            "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        }
+        if t.ndim == 0:
+            return {k: v.item() for k, v in result.items()}
+        return result
+
+    def table(self, thresholds):
+        return pd.DataFrame(self.at(np.asarray(thresholds, dtype=float)))
+
+    def best_f1(self):
+        """Metrics at the threshold (one of the test scores) with the highest F1"""
+        sweep = self.table(np.unique(self.scores))
+        return sweep.loc[sweep["f1"].idxmax()].to_dict()
+
+
+def curve_frame(evaluation, names, kind="roc"):
+    """Long-format curves (x, y, model) for the selected models, ready for st.line_chart"""
+    frames = []
+    for name in names:
+        p = evaluation["probs"][evaluation["models"].index(name)]
+        if kind == "roc":
+            x, y, _ = roc_curve(evaluation["y_true"], p)
+            columns = ("False positive rate", "True positive rate")
+        else:
+            y, x, _ = pr_curve(evaluation["y_true"], p)
+            columns = ("Recall", "Precision")
+        frames.append(pd.DataFrame({columns[0]: x, columns[1]: y, "Model": name}))
+    return pd.concat(frames, ignore_index=True)
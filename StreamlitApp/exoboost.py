@@ -0,0 +1,520 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from calibration import load_calibration, calibrate_models
+from catalog import CATALOG_DB_PATH, COLUMNS, build_catalog_db, score_column
+from drift import DRIFT_REFERENCE_PATH, DriftMonitor, PSI_ALERT, format_report, load_reference
+from inference import (
+    DEFAULT_THRESHOLD, ENSEMBLE_NAME, MODEL_PATHS, build_ensemble, load_models, load_thresholds, positive_proba,
+    predicted_labels,
+)
+from missions import MISSIONS, REGISTRY_PATH, detect_mission, load_registry, mission_artifacts, to_koi_schema
+from prediction_cache import file_digest
+from preprocessing import InputValidator, load_preprocessing, transform_raw
+from retrain import BASE_DATASET, base_split, promote_model, retrain_model, split_new_rows, tree_count
+from similarity import DISPLAY_COLUMNS, SIMILARITY_INDEX_PATH, build_index, save_index
+from uncertainty import monte_carlo
+
+# -------------------------------
+# ExoBoost command line.
+#
+#   python StreamlitApp/exoboost.py score Dataset/cumulative.csv scores.csv --model CatBoost
+#   python StreamlitApp/exoboost.py score Dataset/cumulative.csv scores.csv --threshold 0.7
+#   python StreamlitApp/exoboost.py score Dataset/cumulative.csv scores.csv --samples 1000
+#   python StreamlitApp/exoboost.py score combined_k2_tess.csv scores.csv --mission auto
+#   python StreamlitApp/exoboost.py score new_kois.csv scores.csv --drift-state drift_state.json
+#   python StreamlitApp/exoboost.py drift-report drift_state.json
+#   python StreamlitApp/exoboost.py retrain new_labeled_kois.csv --promote
+#   python StreamlitApp/exoboost.py build-index Dataset/cumulative.csv
+#   python StreamlitApp/exoboost.py build-catalog Dataset/cumulative.csv
+#
+# Run from the repository root so the model paths resolve.
+# -------------------------------
+
+ID_COLUMNS = ["rowid", "kepid", "kepoi_name", "kepler_name"]
+
+# Per-process scoring state, one entry per mission; filled in the parent before
+# forking (shared copy-on-write) or by the pool initializer on platforms without fork.
+_STATE = {}
+_MONITOR = {}
+
+
+def load_scoring_state(model_name, artifacts):
+    """Fitted preprocessing plus the selected (calibrated) model for one registry entry"""
+    models = calibrate_models(
+        load_models(paths=artifacts["models"]), load_calibration(artifacts["calibration"])
+    )
+    model = build_ensemble(models) if model_name == ENSEMBLE_NAME else models.get(model_name)
+    if model is None:
+        raise SystemExit(f"Model {model_name!r} is not available (looked for {list(artifacts['models'].values())}).")
+    prep = load_preprocessing(artifacts["preprocessing"])
+    if prep is None:
+        raise SystemExit(f"{artifacts['preprocessing']} not found; run from the repository root.")
+    return {"model": model, "prep": prep, "validator": InputValidator(prep)}
+
+
+def load_all_states(model_name):
+    """Scoring state for every mission, sharing objects between missions that share artifacts"""
+    registry = load_registry()
+    if "kepler" not in registry:
+        raise SystemExit(f"{REGISTRY_PATH} not found or has no kepler entry; run from the repository root.")
+    loaded = {}
+    fallbacks = []
+    for mission in MISSIONS:
+        artifacts = mission_artifacts(mission, registry)
+        if "fallback_from" in artifacts:
+            fallbacks.append(mission)
+            artifacts = {k: v for k, v in artifacts.items() if k != "fallback_from"}
+        key = json.dumps(artifacts, sort_keys=True)
+        if key not in loaded:
+            loaded[key] = load_scoring_state(model_name, artifacts)
+        _STATE[mission] = loaded[key]
+    if fallbacks:
+        print(f"No artifacts registered for {', '.join(fallbacks)}; those rows use the Kepler-trained models.",
+              file=sys.stderr)
+
+
+def load_monitor(model_name):
+    """Drift monitor over the training reference bins for the selected model"""
+    reference = load_reference()
+    if reference is None:
+        raise SystemExit(f"{DRIFT_REFERENCE_PATH} not found; run from the repository root.")
+    if model_name not in reference["prediction_counts"]:
+        raise SystemExit(f"{DRIFT_REFERENCE_PATH} has no prediction reference for {model_name!r}.")
+    _MONITOR["monitor"] = DriftMonitor(reference, model_name)
+
+
+def _init_worker(model_name, drift):
+    if not _STATE:
+        load_all_states(model_name)
+    if drift and not _MONITOR:
+        load_monitor(model_name)
+
+
+def score_chunk(chunk, input_kind, mission, threshold=DEFAULT_THRESHOLD, mc=None):
+    """Identifiers plus CONFIRMED probability and predicted label (p >= threshold) for one chunk.
+
+    Rows are routed by their `mission` column when present (combined catalogs),
+    otherwise the whole chunk belongs to `mission` ("auto" detects it from the columns).
+    With `mc` ({"samples", "batch_rows", "seed"}) the Monte Carlo summary columns are added.
+    Returns (scores, drift histogram counts or None when no monitor is loaded).
+    """
+    if input_kind == "scaled":
+        state = _STATE["kepler"]
+        X, _ = state["validator"].validate(chunk, mode="clip")
+        p = positive_proba(state["model"], X)
+        features = [X]
+        out = chunk[[c for c in ID_COLUMNS if c in chunk.columns]].copy()
+    else:
+        if "mission" in chunk.columns:
+            row_missions = chunk["mission"].astype(str).str.lower().to_numpy()
+        else:
+            row_missions = np.full(len(chunk), detect_mission(chunk.columns) if mission == "auto" else mission)
+
+        p = np.empty(len(chunk))
+        adapted = []
+        features = []
+        summaries = []
+        rng = np.random.default_rng(mc["seed"]) if mc else None
+        for m in pd.unique(row_missions):
+            rows = np.flatnonzero(row_missions == m)
+            koi = to_koi_schema(chunk.iloc[rows], m)
+            X = transform_raw(koi, _STATE[m]["prep"])
+            p[rows] = positive_proba(_STATE[m]["model"], X)
+            adapted.append(koi[["mission", "object_id", "koi_disposition"]])
+            features.append(X)
+            if mc:
+                summaries.append(monte_carlo(_STATE[m]["model"], koi, _STATE[m]["prep"], mc["samples"], rng,
+                                             mc["batch_rows"], threshold))
+
+        out = pd.concat(adapted).loc[chunk.index].rename(columns={"koi_disposition": "disposition"})
+        for c in ID_COLUMNS:
+            if c in chunk.columns:
+                out[c] = chunk[c]
+
+    out["prob_confirmed"] = p
+    out["prediction"] = predicted_labels(p, threshold)
+    if input_kind != "scaled" and mc:
+        out = out.join(pd.concat(summaries))
+
+    hist = None
+    if _MONITOR:
+        # Row order does not matter for histograms, so per-mission blocks are binned as they are
+        monitor = _MONITOR["monitor"]
+        X = pd.concat(features)[monitor.features].to_numpy()
+        counts, pred = monitor.histogram(X, p)
+        hist = ([c.tolist() for c in counts], pred.tolist())
+    return out, hist
+
+
+def split_missions(chunk, mission):
+    """(mission, rows) parts of a chunk: by its `mission` column, else all rows as one mission"""
+    if "mission" in chunk.columns:
+        row_missions = chunk["mission"].astype(str).str.lower()
+        return [(m, chunk[row_missions == m]) for m in row_missions.unique()]
+    return [(detect_mission(chunk.columns) if mission == "auto" else mission, chunk)]
+
+
+def iter_chunks(path, chunksize, skip_rows):
+    """Input chunks from CSV or Parquet, starting after `skip_rows` data rows.
+
+    CSV rows are skipped after parsing, so comment lines (the `#` preamble of
+    NASA archive downloads) never count towards `skip_rows`.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq  # optional dependency, only needed for Parquet input
+
+        seen = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            if seen + batch.num_rows <= skip_rows:
+                seen += batch.num_rows
+                continue
+            df = batch.to_pandas()
+            if seen < skip_rows:
+                df = df.iloc[skip_rows - seen:]
+            seen += batch.num_rows
+            yield df
+    else:
+        seen = 0
+        for df in pd.read_csv(path, chunksize=chunksize, comment="#"):
+            seen += len(df)
+            if seen <= skip_rows:
+                continue
+            yield df.iloc[max(skip_rows - (seen - len(df)), 0):]
+
+
+def load_progress(progress_path, args):
+    """Checkpoint of a previous run with the same input/model, or a fresh one"""
+    fresh = {"input": args.input, "model": args.model, "threshold": args.threshold,
+             "samples": args.samples, "seed": args.seed, "rows_done": 0, "output_bytes": 0, "drift": None}
+    if not (args.resume and os.path.exists(progress_path)):
+        return fresh
+    with open(progress_path) as f:
+        progress = json.load(f)
+    if progress.get("input") != args.input or progress.get("model") != args.model:
+        raise SystemExit(f"{progress_path} belongs to a different input/model; remove it or drop --resume.")
+    if progress.get("threshold", DEFAULT_THRESHOLD) != args.threshold:
+        raise SystemExit(f"{progress_path} was scored with threshold {progress.get('threshold', DEFAULT_THRESHOLD)}; "
+                         f"pass the same --threshold or drop --resume.")
+    if (progress.get("samples", 0), progress.get("seed", 0)) != (args.samples, args.seed):
+        raise SystemExit(f"{progress_path} was scored with --samples {progress.get('samples', 0)} "
+                         f"--seed {progress.get('seed', 0)}; pass the same values or drop --resume.")
+    return progress
+
+
+def save_progress(progress_path, progress):
+    tmp = progress_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(progress, f)
+    os.replace(tmp, progress_path)
+
+
+def load_drift_state(path, model_name):
+    """Cumulative monitor state saved by earlier runs, or a fresh monitor"""
+    monitor = DriftMonitor(load_reference(), model_name)
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("model") != model_name:
+            raise SystemExit(f"{path} tracks model {state.get('model')!r}; use a separate state file per model.")
+        monitor.load_state(state)
+    return monitor
+
+
+def save_drift_state(path, monitor, model_name):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"model": model_name, **monitor.state()}, f)
+    os.replace(tmp, path)
+
+
+def cmd_score(args):
+    if args.threshold is None:
+        args.threshold = load_thresholds().get(args.model, DEFAULT_THRESHOLD)
+    print(f"Labelling CONFIRMED at P(CONFIRMED) >= {args.threshold}", file=sys.stderr)
+    if args.samples and args.input_kind == "scaled":
+        raise SystemExit("--samples needs raw catalog rows with their _err1/_err2 columns, not --input-kind scaled.")
+    progress_path = args.output + ".progress"
+    progress = load_progress(progress_path, args)
+
+    # Output past the last checkpoint belongs to a chunk that never got recorded
+    mode = "r+b" if progress["output_bytes"] else "wb"
+    if mode == "r+b" and not os.path.exists(args.output):
+        raise SystemExit(f"Cannot resume: {args.output} is missing.")
+    out = open(args.output, mode)
+    out.truncate(progress["output_bytes"])
+    out.seek(progress["output_bytes"])
+
+    if args.resume and progress["rows_done"]:
+        print(f"Resuming after {progress['rows_done']} rows", file=sys.stderr)
+
+    # Load once in the parent; forked workers inherit the models without reloading them
+    drift = args.drift_state is not None
+    if drift:
+        load_monitor(args.model)
+        # Counts of this run so far; merged into the cumulative state only once the run completes
+        run_monitor = DriftMonitor(load_reference(), args.model)
+        if progress.get("drift"):
+            run_monitor.load_state(progress["drift"])
+    ctx = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("fork")
+        load_all_states(args.model)
+        gc.freeze()
+
+    started = time.perf_counter()
+    rows_this_run = 0
+    with ProcessPoolExecutor(args.workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(args.model, drift)) as pool:
+        pending = deque()
+
+        def drain_one():
+            nonlocal rows_this_run
+            result, hist = pending.popleft().result()
+            result.to_csv(out, header=out.tell() == 0, index=False)
+            out.flush()
+            os.fsync(out.fileno())
+            rows_this_run += len(result)
+            progress["rows_done"] += len(result)
+            progress["output_bytes"] = out.tell()
+            status = ""
+            if drift:
+                run_monitor.add(*hist, len(result))
+                progress["drift"] = run_monitor.state()
+                report = run_monitor.report()
+                worst = report["features"][0]
+                status = (f" | drift: prediction PSI {report['prediction']['psi']:.3f}, "
+                          f"max feature PSI {worst['psi']:.3f} ({worst['feature']})")
+                if worst["psi"] > PSI_ALERT or report["prediction"]["psi"] > PSI_ALERT:
+                    status += " ALERT"
+            save_progress(progress_path, progress)
+            elapsed = time.perf_counter() - started
+            print(f"{progress['rows_done']} rows scored | {rows_this_run / elapsed:,.0f} rows/s{status}",
+                  file=sys.stderr)
+
+        # A bounded window of in-flight chunks keeps memory flat; draining in
+        # submission order keeps the output in input order.
+        first_row = progress["rows_done"]
+        for chunk in iter_chunks(args.input, args.chunksize, progress["rows_done"]):
+            # Draws are seeded by the chunk's position, so they do not depend on --workers or --resume
+            mc = {"samples": args.samples, "batch_rows": args.batch_rows, "seed": [args.seed, first_row]} \
+                if args.samples else None
+            pending.append(pool.submit(score_chunk, chunk, args.input_kind, args.mission, args.threshold, mc))
+            first_row += len(chunk)
+            if len(pending) >= 2 * args.workers:
+                drain_one()
+        while pending:
+            drain_one()
+
+    out.close()
+    elapsed = time.perf_counter() - started
+    print(f"Done: {rows_this_run} rows in {elapsed:.2f}s "
+          f"({rows_this_run / max(elapsed, 1e-9):,.0f} rows/s) -> {args.output}", file=sys.stderr)
+
+    if drift:
+        print("\nThis run:\n" + format_report(run_monitor.report()), file=sys.stderr)
+        monitor = load_drift_state(args.drift_state, args.model)
+        monitor.add(run_monitor.counts, run_monitor.pred_counts, run_monitor.rows)
+        save_drift_state(args.drift_state, monitor, args.model)
+        print(f"Cumulative state ({monitor.rows} rows) saved to {args.drift_state}", file=sys.stderr)
+    os.remove(progress_path)
+
+
+def cmd_drift_report(args):
+    if not os.path.exists(args.state):
+        raise SystemExit(f"{args.state} not found.")
+    with open(args.state) as f:
+        model_name = json.load(f)["model"]
+    monitor = load_drift_state(args.state, model_name)
+    if args.json:
+        print(json.dumps(monitor.report(), indent=1))
+    else:
+        print(f"Model: {model_name}")
+        print(format_report(monitor.report(), top=args.top))
+
+
+def cmd_retrain(args):
+    prep = load_preprocessing()
+    if prep is None:
+        raise SystemExit("Models/preprocessing.json not found; run from the repository root.")
+    X_train, X_test, y_train, y_test = base_split(prep, args.base)
+    new_train, new_holdout, y_new_train, y_new_holdout = split_new_rows(
+        pd.read_csv(args.input, comment="#"), args.base, prep, args.holdout_fraction
+    )
+    if len(y_new_train) == 0:
+        raise SystemExit(f"No new labeled CANDIDATE / CONFIRMED rows in {args.input}.")
+    print(f"{len(y_new_train)} new training rows, {len(y_new_holdout)} new holdout rows "
+          f"(+{len(y_train)} / {len(y_test)} from {args.base})", file=sys.stderr)
+
+    # The extra rounds see the whole appended training set, so earlier rows are not forgotten
+    train = (pd.concat([X_train, new_train]), pd.concat([y_train, y_new_train]))
+    holdouts = {
+        "combined": (pd.concat([X_test, new_holdout]), pd.concat([y_test, y_new_holdout])),
+        "base test": (X_test, y_test),
+        "new rows": (new_holdout, y_new_holdout),
+    }
+
+    models = load_models(names=args.models.split(","))
+    for name, model in models.items():
+        rounds = args.rounds or max(1, round(tree_count(model) * 0.1))
+        candidate, result = retrain_model(name, model, train, holdouts, rounds, args.min_delta)
+        print(f"\n{name}: {result['trees'][0]} -> {result['trees'][1]} trees in {result['seconds']:.2f}s")
+        for label, m in result["metrics"].items():
+            if m["current"] is None:
+                continue
+            print(f"  {label:10s} ROC-AUC {m['current']['roc_auc']:.4f} -> {m['candidate']['roc_auc']:.4f} | "
+                  f"log loss {m['current']['log_loss']:.4f} -> {m['candidate']['log_loss']:.4f} | "
+                  f"accuracy {m['current']['accuracy']:.4f} -> {m['candidate']['accuracy']:.4f}")
+        if not result["promote"]:
+            print(f"  kept {MODEL_PATHS[name]}: candidate did not beat the holdout ROC-AUC by {args.min_delta}")
+        elif args.promote:
+            promote_model(MODEL_PATHS[name], candidate)
+            print(f"  promoted to {MODEL_PATHS[name]} (previous model archived in Models/); "
+                  f"rerun the notebook's calibration cell to refresh Models/calibration.json")
+        else:
+            print(f"  passes the gate; rerun with --promote to replace {MODEL_PATHS[name]}")
+
+
+def cmd_build_index(args):
+    prep = load_preprocessing()
+    if prep is None:
+        raise SystemExit("Models/preprocessing.json not found; run from the repository root.")
+    started = time.perf_counter()
+    # Every mission is mapped into the Kepler-fitted feature space, so one index can hold them all
+    catalogs, features = [], []
+    keep = ["object_id", "kepler_name", "mission", "koi_disposition"] + DISPLAY_COLUMNS
+    for chunk in iter_chunks(args.input, args.chunksize, 0):
+        for mission, rows in split_missions(chunk, args.mission):
+            koi = to_koi_schema(rows, mission)
+            catalogs.append(koi[keep])
+            features.append(transform_raw(koi, prep).to_numpy())
+    catalog = pd.concat(catalogs, ignore_index=True)
+    index = build_index(catalog, np.vstack(features), prep["features"], leaf_size=args.leaf_size)
+    save_index(index, args.output)
+    print(f"Indexed {len(catalog)} rows in {time.perf_counter() - started:.2f}s -> {args.output} "
+          f"({os.path.getsize(args.output) / 2**20:.1f} MiB)", file=sys.stderr)
+
+
+def cmd_build_catalog(args):
+    registry = load_registry()
+    if "kepler" not in registry:
+        raise SystemExit(f"{REGISTRY_PATH} not found or has no kepler entry; run from the repository root.")
+    artifacts = registry["kepler"]
+    prep = load_preprocessing(artifacts["preprocessing"])
+    models = calibrate_models(load_models(paths=artifacts["models"]), load_calibration(artifacts["calibration"]))
+    ensemble = build_ensemble(models)
+    if ensemble is not None:
+        models[ENSEMBLE_NAME] = ensemble
+    if prep is None or not models:
+        raise SystemExit("Preprocessing or model files not found; run from the repository root.")
+
+    # Model file digests, so the page can tell which model versions produced the table
+    digests = {name: file_digest(path) for name, path in artifacts["models"].items()}
+    versions = {name: digests.get(name, ",".join(digests.values())) for name in models}
+
+    def scored_chunks():
+        for chunk in iter_chunks(args.input, args.chunksize, 0):
+            for mission, rows in split_missions(chunk, args.mission):
+                koi = to_koi_schema(rows, mission)
+                X = transform_raw(koi, prep)
+                out = koi.reindex(columns=list(COLUMNS)).assign(
+                    kepoi_name=koi["object_id"], disposition=koi["koi_disposition"]
+                )
+                for name, model in models.items():
+                    out[score_column(name)] = positive_proba(model, X)
+                yield out
+
+    started = time.perf_counter()
+    rows = build_catalog_db(scored_chunks(), list(models), args.output, versions)
+    print(f"Scored {rows} rows with {', '.join(models)} in {time.perf_counter() - started:.2f}s -> "
+          f"{args.output} ({os.path.getsize(args.output) / 2**20:.1f} MiB)", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="exoboost", description="ExoBoost exoplanet classifier tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_score = sub.add_parser("score", help="score a catalog file in parallel chunks")
+    p_score.add_argument("input", help="Kepler KOI, K2 or TESS TOI catalog as CSV or Parquet")
+    p_score.add_argument("output", help="CSV file to write, one row per input row in input order")
+    p_score.add_argument("--model", default="CatBoost", choices=list(MODEL_PATHS) + [ENSEMBLE_NAME])
+    p_score.add_argument("--input-kind", default="raw", choices=["raw", "scaled"],
+                         help="raw catalog columns (default) or already-scaled model features")
+    p_score.add_argument("--mission", default="auto", choices=["auto"] + list(MISSIONS),
+                         help="source catalog schema (default: detect from columns; rows of a "
+                              "combined catalog are routed by its `mission` column)")
+    p_score.add_argument("--threshold", type=float, default=None,
+                         help="P(CONFIRMED) cutoff for the predicted label (default: the model's saved "
+                              f"threshold in Models/thresholds.json, else {DEFAULT_THRESHOLD})")
+    p_score.add_argument("--samples", type=int, default=0,
+                         help="Monte Carlo draws per row from the _err1/_err2 error bars; adds mean, std, "
+                              "5/50/95th percentiles and the CONFIRMED fraction of P(CONFIRMED) (default: off)")
+    p_score.add_argument("--batch-rows", type=int, default=200_000,
+                         help="perturbed rows per batched prediction in --samples mode")
+    p_score.add_argument("--seed", type=int, default=0, help="random seed for --samples")
+    p_score.add_argument("--chunksize", type=int, default=20000)
+    p_score.add_argument("--workers", type=int, default=os.cpu_count())
+    p_score.add_argument("--resume", action="store_true",
+                         help="continue an interrupted run from OUTPUT.progress")
+    p_score.add_argument("--drift-state", default=None, metavar="PATH",
+                         help="accumulate feature/prediction drift against the training set into PATH")
+    p_score.set_defaults(func=cmd_score)
+
+    p_drift = sub.add_parser("drift-report", help="PSI/KS drift summary of a --drift-state file")
+    p_drift.add_argument("state", help="state file written by `score --drift-state`")
+    p_drift.add_argument("--top", type=int, default=10, help="features to list, most shifted first")
+    p_drift.add_argument("--json", action="store_true", help="print the full report as JSON")
+    p_drift.set_defaults(func=cmd_drift_report)
+
+    p_retrain = sub.add_parser("retrain", help="warm-start the boosted models on new labeled KOI rows")
+    p_retrain.add_argument("input", help="labeled rows in the cumulative.csv schema (CSV)")
+    p_retrain.add_argument("--base", default=BASE_DATASET,
+                           help="catalog the current models were trained on (default: %(default)s)")
+    p_retrain.add_argument("--models", default=",".join(MODEL_PATHS),
+                           help="comma-separated models to update (default: %(default)s)")
+    p_retrain.add_argument("--rounds", type=int, default=0,
+                           help="extra boosting rounds (default: 10%% of the current tree count)")
+    p_retrain.add_argument("--holdout-fraction", type=float, default=0.3,
+                           help="share of the new rows added to the gate's holdout")
+    p_retrain.add_argument("--min-delta", type=float, default=0.0,
+                           help="holdout ROC-AUC gain required for promotion")
+    p_retrain.add_argument("--promote", action="store_true",
+                           help="replace the live model files when a candidate passes the gate")
+    p_retrain.set_defaults(func=cmd_retrain)
+
+    p_index = sub.add_parser("build-index", help="build the similar-planet search index")
+    p_index.add_argument("input", nargs="?", default=BASE_DATASET,
+                         help="Kepler KOI, K2 or TESS TOI catalog as CSV or Parquet (default: %(default)s)")
+    p_index.add_argument("--output", default=SIMILARITY_INDEX_PATH)
+    p_index.add_argument("--mission", default="auto", choices=["auto"] + list(MISSIONS))
+    p_index.add_argument("--chunksize", type=int, default=100000)
+    p_index.add_argument("--leaf-size", type=int, default=40, help="KD-tree leaf size")
+    p_index.set_defaults(func=cmd_build_index)
+
+    p_catalog = sub.add_parser("build-catalog", help="score a whole catalog into the Catalog page's database")
+    p_catalog.add_argument("input", nargs="?", default=BASE_DATASET,
+                           help="Kepler KOI, K2 or TESS TOI catalog as CSV or Parquet (default: %(default)s)")
+    p_catalog.add_argument("--output", default=CATALOG_DB_PATH)
+    p_catalog.add_argument("--mission", default="auto", choices=["auto"] + list(MISSIONS))
+    p_catalog.add_argument("--chunksize", type=int, default=50000)
+    p_catalog.set_defaults(func=cmd_build_catalog)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+from calibration import CALIBRATION_PATH
+from prediction_cache import file_digest
+
+# -------------------------------
+# Model files (relative to the app's working directory)
+# -------------------------------
+MODEL_PATHS = {
+    "CatBoost": "catboost.pkl",
+    "LightGBM": "lightgbm.pkl",
+}
+
+ENSEMBLE_NAME = "Ensemble (CatBoost + LightGBM)"
+
+POSITIVE_CLASS = "CONFIRMED"
+
+# Per-model decision thresholds on the CONFIRMED probability, tuned on the Research page
+THRESHOLDS_PATH = "Models/thresholds.json"
+DEFAULT_THRESHOLD = 0.5
+
+
+def load_model(path):
+    """Load a pickled model, returning None if the file is missing"""
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def expected_features(model):
+    """Feature names the model was trained on, in training order"""
+    if hasattr(model, "feature_names_"):
+        return list(model.feature_names_)
+    if hasattr(model, "feature_name_"):
+        return list(model.feature_name_)
+    if hasattr(model, "get_booster") and hasattr(model.get_booster(), "feature_name"):
+        return list(model.get_booster().feature_name())
+    return None
+
+
+def align_features(model, X_df):
+    """Reorder DataFrame columns to match the model's training order"""
+    features = expected_features(model)
+    if features is None:
+        return X_df
+    return X_df.reindex(columns=features, fill_value=0)
+
+
+def positive_proba(model, X_df):
+    """Probability of the CONFIRMED class for every row of X_df"""
+    probs = model.predict_proba(align_features(model, X_df))
+    classes = list(getattr(model, "classes_", []))
+    if POSITIVE_CLASS in classes:
+        return np.asarray(probs[:, classes.index(POSITIVE_CLASS)], dtype=float)
+    return np.asarray(probs[:, 1] if probs.shape[1] > 1 else probs[:, 0], dtype=float)
+
+
+def predicted_labels(p, threshold=DEFAULT_THRESHOLD):
+    """CONFIRMED where the probability reaches the threshold, CANDIDATE elsewhere"""
+    return np.where(np.asarray(p) >= threshold, POSITIVE_CLASS, "CANDIDATE")
+
+
+def load_thresholds(path=THRESHOLDS_PATH):
+    """Saved thresholds keyed by model name; models without an entry use DEFAULT_THRESHOLD"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_threshold(name, threshold, path=THRESHOLDS_PATH):
+    thresholds = load_thresholds(path)
+    thresholds[name] = round(float(threshold), 6)
+    with open(path, "w") as f:
+        json.dump(thresholds, f, indent=1)
+        f.write("\n")
+
+
+class EnsembleClassifier:
+    """Weighted average of member CONFIRMED probabilities, scored concurrently"""
+
+    def __init__(self, models, weights=None):
+        self.models = dict(models)
+        if weights is None:
+            weights = {name: 1.0 for name in self.models}
+        total = float(sum(weights[name] for name in self.models))
+        self.weights = {name: weights[name] / total for name in self.models}
+        self.classes_ = np.array(["CANDIDATE", POSITIVE_CLASS])
+        first = next(iter(self.models.values()))
+        self.feature_names_ = expected_features(first)
+
+    def member_proba(self, X_df):
+        """CONFIRMED probability from each member, keyed by model name.
+
+        Both boosters predict in native code and release the GIL, so the members
+        run side by side. The pool belongs to this call: concurrent sessions each
+        get their own threads instead of queueing behind one shared pool.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.models), thread_name_prefix="exoboost-infer") as pool:
+            futures = {
+                name: pool.submit(positive_proba, model, X_df)
+                for name, model in self.models.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def blend(self, members):
+        """Weighted average of the member probabilities returned by member_proba"""
+        return sum(self.weights[name] * members[name] for name in self.models)
+
+    def proba_and_members(self, X_df):
+        """Blended CONFIRMED probability and the member probabilities, each member scored once"""
+        members = self.member_proba(X_df)
+        return self.blend(members), members
+
+    def predict_proba(self, X_df):
+        p = self.blend(self.member_proba(X_df))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X_df):
+        p = self.predict_proba(X_df)[:, 1]
+        return np.where(p >= 0.5, self.classes_[1], self.classes_[0])
+
+
+def load_models(names=None, paths=MODEL_PATHS):
+    """Load the named models (all known models by default), skipping missing files"""
+    names = list(paths) if names is None else names
+    models = {}
+    for name in names:
+        model = load_model(paths[name])
+        if model is not None:
+            models[name] = model
+    return models
+
+
+def build_ensemble(models, weights=None):
+    """Ensemble over every loaded member, or None if any member is missing"""
+    if any(name not in models for name in MODEL_PATHS):
+        return None
+    return EnsembleClassifier({name: models[name] for name in MODEL_PATHS}, weights)
+
+
+def model_version(name, paths=MODEL_PATHS, calibration_path=CALIBRATION_PATH):
+    """Content hashes of the files behind a model name (its pickles and the calibration tables)"""
+    members = list(paths) if name == ENSEMBLE_NAME else [name]
+    digests = [file_digest(paths[member]) for member in members] + [file_digest(calibration_path)]
+    return f"{name}:" + ",".join(digests)
+
+
+def proba_and_members(model, X_df):
+    """CONFIRMED probability plus the member probabilities for an ensemble (None for a single model)"""
+    if hasattr(model, "proba_and_members"):
+        return model.proba_and_members(X_df)
+    return positive_proba(model, X_df), None
+
+
+class RemoteClassifier:
+    """Client for inference_server.py workers, with the same interface as a local model.
+
+    One instance per model name can be shared by every session: requests.Session
+    pools keep-alive connections per host and is safe to use from several threads.
+    """
+
+    def __init__(self, url, name, timeout=30):
+        import requests
+
+        self.base_url = url.rstrip("/")
+        self.name = name
+        self.timeout = timeout
+        self.classes_ = np.array(["CANDIDATE", POSITIVE_CLASS])
+        self._session = requests.Session()
+        self._version = None
+
+    def _post(self, X_df):
+        response = self._session.post(
+            self.base_url + "/predict",
+            json={"model": self.name, "rows": X_df.to_dict(orient="records")},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        body = response.json()
+        self._version = body.get("version", self._version)
+        return body
+
+    def version(self):
+        """Model version reported by the server (refreshed by every prediction)"""
+        if self._version is None:
+            response = self._session.get(self.base_url + "/healthz", timeout=self.timeout)
+            response.raise_for_status()
+            self._version = response.json()["versions"][self.name]
+        return self._version
+
+    def proba_and_members(self, X_df):
+        """CONFIRMED probability and member probabilities (None for a single model) from one request"""
+        body = self._post(X_df)
+        members = body.get("members")
+        if members is not None:
+            members = {name: np.asarray(p, dtype=float) for name, p in members.items()}
+        return np.asarray(body["prob_confirmed"], dtype=float), members
+
+    def predict_proba(self, X_df):
+        p, _ = self.proba_and_members(X_df)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X_df):
+        p = self.predict_proba(X_df)[:, 1]
+        return np.where(p >= 0.5, self.classes_[1], self.classes_[0])
+
+    def member_proba(self, X_df):
+        return self.proba_and_members(X_df)[1] or {}
@@ -0,0 +1,262 @@
+import argparse
+import gc
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Keep each worker's native thread pools to one thread; parallelism comes from the workers.
+# Must be set before the boosting libraries are imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+import numpy as np
+import pandas as pd
+
+from calibration import load_calibration, calibrate_models
+from inference import ENSEMBLE_NAME, build_ensemble, load_models, model_version, proba_and_members
+from tracing import render_prometheus, span
+
+# -------------------------------
+# Pre-fork inference server.
+#
+# The parent loads every model once, freezes the GC so collections never write
+# to the loaded objects, binds one listening socket and then forks the workers.
+# Model memory (the native CatBoost / LightGBM tree buffers in particular) is
+# shared copy-on-write between all workers; the kernel spreads connections
+# across the workers accepting on the shared socket.
+#
+# Usage (from the repository root):
+#   python StreamlitApp/inference_server.py serve --workers 4 --port 8502
+#   EXOBOOST_INFERENCE_URL=http://127.0.0.1:8502 streamlit run StreamlitApp/Home.py
+#   python StreamlitApp/inference_server.py bench --workers 1,2,4
+# -------------------------------
+
+MODELS = {}
+VERSIONS = {}  # model name -> content hash of its files, reported to clients for their cache keys
+
+
+def load_all_models():
+    """Calibrated single models plus the ensemble, keyed by the names the app uses"""
+    models = calibrate_models(load_models(), load_calibration())
+    ensemble = build_ensemble(models)
+    if ensemble is not None:
+        models[ENSEMBLE_NAME] = ensemble
+    return models
+
+
+class PredictHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse connections
+    disable_nagle_algorithm = True  # small JSON replies must not wait for delayed ACKs
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, json.dumps({"pid": os.getpid(), "models": list(MODELS), "versions": VERSIONS}))
+        elif self.path == "/metrics":
+            self._send(200, render_prometheus(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, json.dumps({"error": "not found"}))
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send(404, json.dumps({"error": "not found"}))
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            name = payload.get("model", "CatBoost")
+            model = MODELS[name]
+            with span("server.predict_proba"):
+                # One pass: an ensemble's blend is computed from the member scores it returns
+                p, members = proba_and_members(model, pd.DataFrame(payload["rows"]))
+            response = {"prob_confirmed": p.tolist(), "version": VERSIONS[name]}
+            if members is not None:
+                response["members"] = {member: q.tolist() for member, q in members.items()}
+            self._send(200, json.dumps(response))
+        except KeyError as e:
+            self._send(400, json.dumps({"error": f"unknown model or missing field: {e}"}))
+        except Exception as e:
+            self._send(500, json.dumps({"error": str(e)}))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def worker_main(sock):
+    """Serve requests on the inherited listening socket until SIGTERM"""
+    server = ThreadingHTTPServer(sock.getsockname()[:2], PredictHandler, bind_and_activate=False)
+    server.socket = sock
+    signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+    signal.signal(signal.SIGINT, signal.default_int_handler)  # a respawned worker inherits the parent's handler
+    server.serve_forever()
+
+
+def serve(host, port, workers, ready=None):
+    """Load models, fork `workers` processes on one socket and respawn any that die"""
+    MODELS.update(load_all_models())
+    VERSIONS.update({name: model_version(name) for name in MODELS})
+    if not MODELS:
+        sys.exit("No models found; run from the repository root so the .pkl paths resolve.")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+
+    # Everything allocated so far is moved to a permanent generation, so cyclic
+    # GC in the children never touches (and un-shares) the model pages.
+    gc.freeze()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            worker_main(sock)
+            os._exit(0)
+        children[pid] = time.monotonic()
+        return pid
+
+    children = {}  # pid -> start time
+    for _ in range(workers):
+        spawn()
+
+    print(f"Serving {', '.join(MODELS)} on http://{host}:{sock.getsockname()[1]} "
+          f"with {workers} worker(s): {list(children)}", flush=True)
+    if ready is not None:
+        ready.put((sock.getsockname()[1], list(children)))
+
+    def shutdown(*_):
+        for pid in list(children):
+            os.kill(pid, signal.SIGTERM)
+        for pid in list(children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    # Replace any worker that dies. The replacement is forked from this same
+    # parent, so it shares the frozen model pages exactly like the originals.
+    while True:
+        pid, status = os.wait()
+        started = children.pop(pid, None)
+        if started is None:
+            continue
+        print(f"Worker {pid} exited ({os.waitstatus_to_exitcode(status)}); starting a replacement", flush=True)
+        if time.monotonic() - started < 1.0:
+            time.sleep(1.0)  # a worker failing at startup would otherwise be respawned in a tight loop
+        spawn()
+
+
+# -------------------------------
+# Benchmark: per-worker memory and aggregate throughput
+# -------------------------------
+def smaps_rollup(pid):
+    """Rss / Pss / Shared / Private (kB) of a process, from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def client_loop(port, model, body_rows, duration, counter):
+    """Send back-to-back predict requests over one keep-alive connection"""
+    body = json.dumps({"model": model, "rows": body_rows})
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    deadline = time.perf_counter() + duration
+    done = 0
+    while time.perf_counter() < deadline:
+        conn.request("POST", "/predict", body, {"Content-Type": "application/json"})
+        conn.getresponse().read()
+        done += 1
+    counter.put(done)
+
+
+def bench(worker_counts, clients, duration, model, batch_rows):
+    with open("Models/preprocessing.json") as f:
+        features = json.load(f)["features"]
+    rng = np.random.default_rng(0)
+    rows = [dict(zip(features, rng.uniform(-0.5, 1.5, len(features)))) for _ in range(batch_rows)]
+
+    print(f"{'workers':>7s} {'req/s':>9s} {'rows/s':>9s} {'RSS/worker MiB':>15s} "
+          f"{'PSS/worker MiB':>15s} {'shared MiB':>11s} {'total PSS MiB':>14s}")
+    for n in worker_counts:
+        ready = multiprocessing.Queue()
+        server = multiprocessing.Process(target=serve, args=("127.0.0.1", 0, n, ready), daemon=True)
+        server.start()
+        port, children = ready.get(timeout=300)
+
+        counter = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=client_loop, args=(port, model, rows, duration, counter))
+            for _ in range(clients or n)
+        ]
+        for p in procs:
+            p.start()
+        total = sum(counter.get() for _ in procs)
+        for p in procs:
+            p.join()
+
+        mem = [smaps_rollup(pid) for pid in children]
+        parent = smaps_rollup(server.pid)
+        total_pss = sum(m["pss"] for m in mem) + parent["pss"]
+        print(f"{n:7d} {total / duration:9.1f} {total * batch_rows / duration:9.1f} "
+              f"{np.mean([m['rss'] for m in mem]) / 1024:15.1f} "
+              f"{np.mean([m['pss'] for m in mem]) / 1024:15.1f} "
+              f"{np.mean([m['shared'] for m in mem]) / 1024:11.1f} {total_pss / 1024:14.1f}", flush=True)
+
+        os.kill(server.pid, signal.SIGTERM)
+        server.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-fork inference workers sharing model memory.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="run the inference workers")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8502)
+    p_serve.add_argument("--workers", type=int, default=os.cpu_count())
+
+    p_bench = sub.add_parser("bench", help="measure RSS and throughput as workers scale")
+    p_bench.add_argument("--workers", default=None,
+                         help="comma-separated worker counts (default: powers of two up to the core count)")
+    p_bench.add_argument("--clients", type=int, default=0,
+                         help="concurrent client processes (default: one per worker)")
+    p_bench.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    p_bench.add_argument("--model", default="CatBoost")
+    p_bench.add_argument("--batch-rows", type=int, default=1, help="rows per request")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.host, args.port, args.workers)
+    else:
+        if args.workers:
+            counts = [int(x) for x in args.workers.split(",")]
+        else:
+            counts = [2 ** i for i in range(os.cpu_count().bit_length()) if 2 ** i <= os.cpu_count()]
+        bench(counts, args.clients, args.duration, args.model, args.batch_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import argparse
+import io
+import os
+import random
+import sys
+import threading
+import time
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from PIL import Image
+
+from session_store import process_rss
+
+# -------------------------------
+# Load generator for the Streamlit pages.
+#
+# Every simulated session is a Streamlit AppTest instance, so the real page
+# scripts run with their own session state while sharing this process's
+# st.cache_resource objects, exactly like sessions inside one server process.
+# The User-centric image call is pointed at a local stub backend.
+#
+# Usage (from the repository root):
+#   python StreamlitApp/loadtest.py --sessions 1,4,16 --iterations 3
+# -------------------------------
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+RESEARCH_PAGE = os.path.join(APP_DIR, "pages", "Research-centric.py")
+USER_PAGE = os.path.join(APP_DIR, "pages", "User-centric.py")
+
+
+def make_stub_png(size=256):
+    """A small noise image standing in for the text-to-image response"""
+    pixels = np.random.default_rng(0).integers(0, 255, (size, size, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def start_stub_image_backend(delay=0.0, port=0):
+    """Serve a fixed PNG for every POST, after `delay` seconds; returns (server, url)"""
+    png = make_stub_png()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(png)))
+            self.end_headers()
+            self.wfile.write(png)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/generate"
+
+
+class StepTimer:
+    """Thread-safe collection of per-step latencies"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def time(self, step, fn):
+        start = time.perf_counter()
+        at = fn()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.samples[step].append(elapsed)
+            if at is not None and len(at.exception):
+                self.errors[step] += 1
+        return at
+
+
+def click(at, label):
+    """Click the first button whose label contains `label` and rerun"""
+    return next(b for b in at.button if label in b.label).click().run()
+
+
+def research_flow(timer, timeout):
+    """Open the page, fill all 34 inputs, predict with CatBoost and the ensemble"""
+    from streamlit.testing.v1 import AppTest
+
+    at = timer.time("research.open", lambda: AppTest.from_file(RESEARCH_PAGE, default_timeout=timeout).run())
+
+    def fill():
+        for widget in at.number_input:
+            widget.set_value(random.uniform(-0.5, 1.5))
+        return at.run()
+
+    timer.time("research.fill_inputs", fill)
+    timer.time("research.predict", lambda: click(at, "Predict"))
+    model_select = next(w for w in at.selectbox if w.label == "🧠 Select Model")
+    model_select.set_value(model_select.options[-1])
+    timer.time("research.switch_model", lambda: at.run())
+    timer.time("research.predict_ensemble", lambda: click(at, "Predict"))
+
+
+def user_flow(timer, timeout):
+    """Walk the 7-question wizard and request the planet image from the stub"""
+    from streamlit.testing.v1 import AppTest
+
+    at = timer.time("user.open", lambda: AppTest.from_file(USER_PAGE, default_timeout=timeout).run())
+    at.text_input[0].set_value(f"Explorer{random.randint(0, 9999)}")
+    timer.time("user.enter_name", lambda: at.run())
+    timer.time("user.start", lambda: click(at, "Start"))
+    timer.time("user.explanation", lambda: click(at, "Create My Planet"))
+
+    def answer():
+        for radio in at.radio:
+            radio.set_value(random.choice(radio.options))
+        return at.run()
+
+    timer.time("user.answer_questions", answer)
+    timer.time("user.result", lambda: click(at, "Create My Exoplanet"))
+    timer.time("user.generate_image", lambda: click(at, "Generate Image"))
+
+
+FLOWS = {"research": research_flow, "user": user_flow}
+
+
+def run_level(n_sessions, flows, iterations, timeout):
+    """Run n concurrent sessions, each repeating every flow `iterations` times"""
+    timer = StepTimer()
+
+    def session():
+        for _ in range(iterations):
+            for flow in flows:
+                FLOWS[flow](timer, timeout)
+
+    cpu_start = os.times()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        for future in [pool.submit(session) for _ in range(n_sessions)]:
+            future.result()
+    wall = time.perf_counter() - wall_start
+    cpu_end = os.times()
+    cpu = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+    return timer, wall, cpu, process_rss()
+
+
+def print_report(n_sessions, timer, wall, cpu, rss):
+    print(f"\n=== {n_sessions} concurrent session(s) | wall {wall:.2f}s | "
+          f"CPU {cpu:.2f}s ({cpu / wall * 100:.0f}% of one core) | RSS {rss / 2**20:.1f} MiB ===")
+    print(f"{'step':28s} {'n':>5s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s} {'errors':>6s}")
+    for step, samples in timer.samples.items():
+        ms = np.asarray(samples) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        print(f"{step:28s} {len(ms):5d} {p50:9.1f} {p95:9.1f} {p99:9.1f} {ms.max():9.1f} "
+              f"{timer.errors.get(step, 0):6d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent Streamlit sessions against the app pages.")
+    parser.add_argument("--sessions", default="1,4,16",
+                        help="comma-separated concurrency levels (default: 1,4,16)")
+    parser.add_argument("--iterations", type=int, default=2, help="flows per session at each level")
+    parser.add_argument("--flows", default="research,user", help="comma-separated: research,user")
+    parser.add_argument("--stub-delay", type=float, default=0.0,
+                        help="seconds the stub image backend waits before answering")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-rerun timeout in seconds")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    sys.path.insert(0, APP_DIR)  # what `streamlit run StreamlitApp/Home.py` does for the pages
+
+    server, url = start_stub_image_backend(args.stub_delay)
+    os.environ["EXOBOOST_IMAGE_API_URL"] = url
+
+    flows = [f for f in args.flows.split(",") if f]
+    for n in [int(x) for x in args.sessions.split(",")]:
+        print_report(n, *run_level(n, flows, args.iterations, args.timeout))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
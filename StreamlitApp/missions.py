@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Schema adapters: K2 / TESS TOI catalog rows -> Kepler KOI (cumulative.csv) schema
+#
+# Column names follow the NASA Exoplanet Archive tables:
+#   K2:   "K2 Planets and Candidates" (k2pandc)
+#   TESS: "TESS Objects of Interest" (TOI)
+# Canonical columns a mission does not measure are left NaN and are filled with the
+# training medians by the fitted preprocessing.
+# -------------------------------
+
+REGISTRY_PATH = "Models/registry.json"
+
+KOI_COLUMNS = [
+    "rowid", "kepid", "kepoi_name", "kepler_name", "koi_disposition", "koi_pdisposition", "koi_score",
+    "koi_fpflag_nt", "koi_fpflag_ss", "koi_fpflag_co", "koi_fpflag_ec",
+    "koi_period", "koi_period_err1", "koi_period_err2",
+    "koi_time0bk", "koi_time0bk_err1", "koi_time0bk_err2",
+    "koi_impact", "koi_impact_err1", "koi_impact_err2",
+    "koi_duration", "koi_duration_err1", "koi_duration_err2",
+    "koi_depth", "koi_depth_err1", "koi_depth_err2",
+    "koi_prad", "koi_prad_err1", "koi_prad_err2",
+    "koi_teq", "koi_teq_err1", "koi_teq_err2",
+    "koi_insol", "koi_insol_err1", "koi_insol_err2",
+    "koi_model_snr", "koi_tce_plnt_num", "koi_tce_delivname",
+    "koi_steff", "koi_steff_err1", "koi_steff_err2",
+    "koi_slogg", "koi_slogg_err1", "koi_slogg_err2",
+    "koi_srad", "koi_srad_err1", "koi_srad_err2",
+    "ra", "dec", "koi_kepmag",
+]
+
+# Measurement columns shared by K2 and TESS (canonical <- source, including err1/err2).
+# pl_tranmid is deliberately not mapped to koi_time0bk: the model learned Kepler-era
+# epochs (BKJD ~130-280), and K2 / TESS epochs land at ~2000-5000 BKJD, far past the
+# training clip bound. The transit epoch says nothing about the planet itself, so
+# koi_time0bk and its errors stay NaN and take the training median instead.
+_COMMON = {
+    "koi_period": "pl_orbper",
+    "koi_prad": "pl_rade",
+    "koi_teq": "pl_eqt",
+    "koi_insol": "pl_insol",
+    "koi_steff": "st_teff",
+    "koi_slogg": "st_logg",
+    "koi_srad": "st_rad",
+}
+
+_DISPOSITIONS = {
+    "k2": {"CONFIRMED": "CONFIRMED", "CANDIDATE": "CANDIDATE", "FALSE POSITIVE": "FALSE POSITIVE"},
+    "tess": {"KP": "CONFIRMED", "CP": "CONFIRMED", "PC": "CANDIDATE", "APC": "CANDIDATE",
+             "FP": "FALSE POSITIVE", "FA": "FALSE POSITIVE"},
+}
+
+MISSIONS = {
+    "kepler": None,  # already in the canonical schema
+    "k2": {
+        "id": "pl_name",
+        "disposition": "disposition",
+        "columns": {**_COMMON, "koi_impact": "pl_imppar", "koi_duration": "pl_trandur",
+                    "koi_depth": "pl_trandep"},
+        "scalar": {"ra": "ra", "dec": "dec", "koi_kepmag": "sy_kepmag"},
+        # k2pandc reports transit depth in percent
+        "scale": {"koi_depth": 1e4},
+    },
+    "tess": {
+        "id": "toi",
+        "disposition": "tfopwg_disp",
+        "columns": {**_COMMON, "koi_duration": "pl_trandurh", "koi_depth": "pl_trandep"},
+        # No impact parameter, model SNR or Kepler magnitude in the TOI table
+        "scalar": {"ra": "ra", "dec": "dec"},
+        "scale": {},
+    },
+}
+
+
+def detect_mission(columns):
+    """Best guess of the source mission from a table's column names"""
+    columns = set(columns)
+    if "koi_period" in columns:
+        return "kepler"
+    if "toi" in columns or "tfopwg_disp" in columns:
+        return "tess"
+    if "pl_orbper" in columns:
+        return "k2"
+    raise ValueError("Unrecognised catalog schema; expected Kepler KOI, K2 or TESS TOI columns.")
+
+
+def to_koi_schema(df, mission):
+    """Vectorized rename + unit conversion of one mission's rows into the KOI schema"""
+    if mission == "kepler":
+        out = df.reindex(columns=KOI_COLUMNS)
+        out["object_id"] = df["kepoi_name"] if "kepoi_name" in df.columns else df.index.astype(str)
+        out["mission"] = mission
+        return out
+
+    spec = MISSIONS[mission]
+    n = len(df)
+    data = {c: np.full(n, np.nan) for c in KOI_COLUMNS}
+
+    def source(col):
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) if col in df.columns \
+            else np.full(n, np.nan)
+
+    for canonical, src in spec["columns"].items():
+        factor = spec["scale"].get(canonical, 1.0)
+        data[canonical] = source(src) * factor
+        data[canonical + "_err1"] = source(src + "err1") * factor
+        data[canonical + "_err2"] = source(src + "err2") * factor
+    for canonical, src in spec["scalar"].items():
+        data[canonical] = source(src)
+
+    out = pd.DataFrame(data, index=df.index)
+    if spec["disposition"] in df.columns:
+        out["koi_disposition"] = df[spec["disposition"]].map(_DISPOSITIONS[mission])
+    out["object_id"] = df[spec["id"]].astype(str) if spec["id"] in df.columns else df.index.astype(str)
+    out["mission"] = mission
+    return out
+
+
+# -------------------------------
+# Artifact registry: fitted preprocessing, calibration and models per mission
+# -------------------------------
+def load_registry(path=REGISTRY_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def mission_artifacts(mission, registry):
+    """Artifact paths for a mission; falls back to the Kepler artifacts when none are registered"""
+    if mission in registry:
+        return registry[mission]
+    return dict(registry["kepler"], fallback_from=mission)
+
+
+def register_mission(mission, preprocessing, calibration, models, path=REGISTRY_PATH):
+    """Record a mission's fitted artifacts (paths relative to the repository root)"""
+    registry = load_registry(path)
+    registry[mission] = {"preprocessing": preprocessing, "calibration": calibration, "models": models}
+    with open(path, "w") as f:
+        json.dump(registry, f, indent=1)
+        f.write("\n")
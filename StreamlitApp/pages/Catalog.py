@@ -0,0 +1,107 @@
+import math
+import os
+
+import streamlit as st
+
+from catalog import CATALOG_DB_PATH, CatalogReader
+from session_store import track_session
+from tracing import span, start_page_run, finish_page_run
+
+st.set_page_config(page_title="Catalog", page_icon="🗂️", layout="wide")
+
+run_started = start_page_run()
+
+st.title("🗂️ Catalog Scores")
+st.markdown(
+    "Every object in `Dataset/cumulative.csv` scored once by each production model. "
+    "Filtering, sorting and paging run as SQL queries, so only the page on screen is sent to the browser."
+)
+
+if not os.path.exists(CATALOG_DB_PATH):
+    st.info(
+        f"`{CATALOG_DB_PATH}` not found. Build it from the repository root with "
+        "`python StreamlitApp/exoboost.py build-catalog`."
+    )
+    st.stop()
+
+# One read-only connection per process; a rebuilt file has a new mtime and is reopened
+@st.cache_resource
+def get_catalog(path, mtime):
+    return CatalogReader(path)
+
+catalog = get_catalog(CATALOG_DB_PATH, os.path.getmtime(CATALOG_DB_PATH))
+st.caption(f"{catalog.meta['rows']} rows · built {catalog.meta['built_at']}")
+
+SORT_OPTIONS = {
+    "Model score": None,  # the selected model's probability
+    "NASA disposition score": "koi_score",
+    "Orbital period": "koi_period",
+    "Planet radius": "koi_prad",
+    "Equilibrium temperature": "koi_teq",
+    "KOI name": "kepoi_name",
+}
+
+# ---------- FILTERS ----------
+col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
+model_name = col1.selectbox("🧠 Model", list(catalog.models))
+dispositions = col2.multiselect(
+    "Disposition", catalog.dispositions,
+    default=["CANDIDATE"] if "CANDIDATE" in catalog.dispositions else [],
+)
+min_prob = col3.slider("Minimum P(CONFIRMED)", 0.0, 1.0, 0.0, 0.01)
+search = col4.text_input("Search name / Kepler ID").strip()
+
+col5, col6, col7 = st.columns([2, 1, 1])
+sort_label = col5.selectbox("Sort by", list(SORT_OPTIONS))
+descending = col6.toggle("Descending", value=True)
+page_size = col7.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+# Any filter change starts again from the first page
+filters = (model_name, tuple(dispositions), min_prob, search, sort_label, descending, page_size)
+if st.session_state.get("catalog_filters") != filters:
+    st.session_state.catalog_filters = filters
+    st.session_state.catalog_page = 1
+
+def query_page():
+    with span("catalog.query"):
+        return catalog.page(
+            model_name,
+            dispositions=dispositions,
+            min_prob=min_prob,
+            search=search,
+            sort=SORT_OPTIONS[sort_label] or catalog.models[model_name],
+            descending=descending,
+            limit=page_size,
+            offset=(st.session_state.catalog_page - 1) * page_size,
+        )
+
+rows, total = query_page()
+n_pages = max(1, math.ceil(total / page_size))
+# A rebuilt catalog can leave fewer pages than the saved page number; clamp it
+# before the page widget is created, which rejects values above max_value
+if not 1 <= st.session_state.catalog_page <= n_pages:
+    st.session_state.catalog_page = min(max(1, st.session_state.catalog_page), n_pages)
+    rows, total = query_page()
+
+# ---------- RESULTS ----------
+score_names = {column: name for name, column in catalog.models.items()}
+st.dataframe(
+    rows.rename(columns=score_names),
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        name: st.column_config.ProgressColumn(name, min_value=0.0, max_value=1.0, format="%.3f")
+        for name in catalog.models
+    },
+)
+
+def change_page(step):
+    st.session_state.catalog_page = min(max(1, st.session_state.catalog_page + step), n_pages)
+
+nav1, nav2, nav3 = st.columns([1, 2, 1])
+nav1.button("◀ Previous", on_click=change_page, args=(-1,), disabled=st.session_state.catalog_page <= 1)
+nav2.number_input(f"Page (of {n_pages}, {total} matching rows)", 1, n_pages, key="catalog_page")
+nav3.button("Next ▶", on_click=change_page, args=(1,), disabled=st.session_state.catalog_page >= n_pages)
+
+finish_page_run("catalog", run_started)
+track_session("catalog")
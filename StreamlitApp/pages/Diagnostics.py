@@ -0,0 +1,63 @@
+import streamlit as st
+import pandas as pd
+
+from session_store import SESSION_IDLE_TTL, image_cache, process_rss, session_registry, track_session
+from tracing import snapshot, render_prometheus, start_page_run, finish_page_run
+
+st.set_page_config(page_title="Diagnostics", page_icon="⏱️", layout="wide")
+
+run_started = start_page_run()
+
+st.title("⏱️ Diagnostics")
+st.markdown(
+    "Latency of each instrumented stage, aggregated over every session served by this process. "
+    "Percentiles are histogram bucket upper bounds. Set `EXOBOOST_METRICS_PORT` to expose the same "
+    "data at `/metrics` for Prometheus, or `EXOBOOST_TRACE_LOG=1` to log every span."
+)
+
+rows = snapshot()
+
+if rows:
+    spans_df = pd.DataFrame(rows).set_index("span")
+    st.dataframe(
+        spans_df.style.format({"mean_s": "{:.4f}", "p50_s": "{:g}", "p95_s": "{:g}", "p99_s": "{:g}"}),
+        use_container_width=True,
+    )
+    st.bar_chart(spans_df["mean_s"])
+else:
+    st.info("No spans recorded yet. Open the other pages to generate some traffic.")
+
+# ---------- MEMORY ----------
+st.header("🧠 Memory")
+track_session("diagnostics")  # before the table, so this session is listed too
+
+registry = session_registry()
+sessions = registry.stats()
+images = image_cache().stats()
+
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("Process RSS", f"{process_rss() / 2**20:.1f} MiB")
+m2.metric("Sessions", len(sessions), f"{registry.evictions} evicted when idle", delta_color="off")
+m3.metric("App-owned session values", f"{sum(r['bytes'] for r in sessions) / 2**10:.1f} KiB")
+m4.metric(
+    "Shared image store",
+    f"{images['bytes'] / 2**20:.1f} / {images['max_bytes'] / 2**20:.0f} MiB",
+    f"{images['entries']} images, {images['evictions']} evicted",
+    delta_color="off",
+)
+
+if sessions:
+    st.dataframe(pd.DataFrame(sessions), use_container_width=True, hide_index=True)
+st.caption(
+    "Sizes cover the values the app keeps per session (feature arrays, image keys); widget values are held "
+    f"by Streamlit and not counted. Sessions idle for more than {SESSION_IDLE_TTL / 60:.0f} min are "
+    "dropped (`EXOBOOST_SESSION_IDLE_TTL`, seconds); the image store is capped by `EXOBOOST_IMAGE_CACHE_MB`."
+)
+
+with st.expander("Prometheus exposition"):
+    st.code(render_prometheus(), language="text")
+
+if st.button("🔄 Refresh"):
+    st.rerun()
+
+finish_page_run("diagnostics", run_started)
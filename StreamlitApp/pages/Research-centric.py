@@ -1,13 +1,30 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
 import os
-from PIL import Image
 import base64
 
+from tracing import span, start_page_run, finish_page_run
+from inference import (
+    MODEL_PATHS, ENSEMBLE_NAME, DEFAULT_THRESHOLD, load_models, build_ensemble, align_features, positive_proba,
+    proba_and_members, predicted_labels, load_thresholds, save_threshold, model_version, RemoteClassifier,
+)
+from calibration import load_calibration, calibrate_models
+from catalog import CATALOG_DB_PATH, CatalogReader
+from evaluation import load_evaluation, metrics_table, curve_frame, confusion_matrix, app_scores, ThresholdSweep
+from prediction_cache import PredictionCache, quantize
+from preprocessing import PREPROCESSING_PATH, load_preprocessing, InputValidator
+from session_store import session_values
+from similarity import SIMILARITY_INDEX_PATH, load_index, similar_planets
+from whatif import grid_axes, heatmap_frame, sweep_grid
+
 st.set_page_config(page_title="Exoplanet Classifier", layout="wide")
 
+# -------------------------------
+# Tracing & Profiling
+# -------------------------------
+run_started = start_page_run()
+
 # -------------------------------
 # Local Background Image (Base64 Method)
 # -------------------------------
@@ -19,7 +36,8 @@ def get_base64_of_bin_file(bin_file):
     return base64.b64encode(data).decode()
 
 if os.path.exists(bg_image_path):
-    bin_str = get_base64_of_bin_file(bg_image_path)
+    with span("research.background_b64"):
+        bin_str = get_base64_of_bin_file(bg_image_path)
     page_bg = f"""
     <style>
     [data-testid="stAppViewContainer"] {{
@@ -136,6 +154,164 @@ st.markdown(lightgbm_info)
 st.divider()
 
 
+# ---------- CALIBRATION ----------
+calibration = load_calibration()
+
+if calibration:
+    st.header("🎯 Probability Calibration")
+    st.markdown(
+        "Boosted-tree probabilities are not calibrated out of the box, so the demo maps them through "
+        "isotonic tables fitted on out-of-fold predictions from the training set. "
+        "A table is only applied when it lowers the out-of-fold Expected Calibration Error (ECE) on the "
+        "training folds; the test-split ECE and reliability diagrams are reported only:"
+    )
+
+    st.table(pd.DataFrame([
+        {
+            "Model": name,
+            "Out-of-fold ECE (raw)": f"{table['oof_ece']['raw']:.4f}" if "oof_ece" in table else "—",
+            "Out-of-fold ECE (calibrated)": f"{table['oof_ece']['calibrated']:.4f}" if "oof_ece" in table else "—",
+            "Test ECE (raw)": f"{table['test_reliability']['raw']['ece']:.4f}",
+            "Test ECE (calibrated)": f"{table['test_reliability']['calibrated']['ece']:.4f}",
+            "Applied": "✅" if table.get("applied", True) else "—",
+        }
+        for name, table in calibration.items()
+    ]))
+
+    rel_cols = st.columns(len(calibration))
+    for col, (name, table) in zip(rel_cols, calibration.items()):
+        col.markdown(f"**Reliability diagram — {name}**")
+        curves = {}
+        for label, bins in table["test_reliability"].items():
+            counts = np.asarray(bins["count"])
+            curves[label] = pd.Series(
+                np.asarray(bins["frac_pos"])[counts > 0],
+                index=np.asarray(bins["mean_pred"])[counts > 0],
+            )
+        curves["perfect"] = pd.Series([0.0, 1.0], index=[0.0, 1.0])
+        col.line_chart(pd.DataFrame(curves).sort_index().interpolate(method="index"))
+
+    st.divider()
+
+
+# ---------- EVALUATION ----------
+# Test-set probabilities stored by the training notebook; nothing below loads or runs a model
+# The stored test probabilities and the metrics table derived from them are static: compute once per process
+@st.cache_resource
+def get_evaluation():
+    evaluation = load_evaluation()
+    if evaluation is None:
+        return None, None
+    with span("research.evaluation_metrics"):
+        return evaluation, metrics_table(evaluation)
+
+evaluation, results_df = get_evaluation()
+
+# Decision threshold per model for this session, starting from the saved defaults
+if "thresholds" not in st.session_state:
+    st.session_state.thresholds = load_thresholds()
+
+if evaluation:
+    st.header("📈 Model Evaluation")
+    st.markdown(
+        f"All {len(evaluation['models'])} models trained in the notebook, evaluated on the "
+        f"{len(evaluation['y_true'])}-row test split from their stored CONFIRMED probabilities "
+        "(threshold 0.5 for the label metrics)."
+    )
+
+    st.dataframe(results_df.style.format(precision=4), use_container_width=True, hide_index=True)
+
+    selected_models = st.multiselect(
+        "Models to compare",
+        evaluation["models"],
+        default=[m for m in MODEL_PATHS if m in evaluation["models"]],
+    )
+    if selected_models:
+        roc_col, pr_col = st.columns(2)
+        roc_col.markdown("**ROC curve**")
+        roc_col.line_chart(
+            curve_frame(evaluation, selected_models, "roc"),
+            x="False positive rate", y="True positive rate", color="Model",
+        )
+        pr_col.markdown("**Precision-Recall curve**")
+        pr_col.line_chart(
+            curve_frame(evaluation, selected_models, "pr"),
+            x="Recall", y="Precision", color="Model",
+        )
+
+        cm_cols = st.columns(min(len(selected_models), 3))
+        for i, name in enumerate(selected_models):
+            col = cm_cols[i % len(cm_cols)]
+            col.markdown(f"**Confusion matrix — {name}**")
+            p = evaluation["probs"][evaluation["models"].index(name)]
+            col.dataframe(confusion_matrix(evaluation["y_true"], p), use_container_width=True)
+
+    # ---------- DECISION THRESHOLD ----------
+    # Sorted calibrated test scores per model; every slider move is a binary search, not a re-score.
+    # The threshold curves and best-F1 points do not depend on the slider, so they are built here once.
+    @st.cache_resource
+    def get_threshold_sweeps():
+        scores = app_scores(evaluation, load_calibration(), list(MODEL_PATHS), ENSEMBLE_NAME)
+        sweeps = {name: ThresholdSweep(evaluation["y_true"], p) for name, p in scores.items()}
+        curves = {
+            name: sweep.table(np.linspace(0.0, 1.0, 101)).set_index("threshold")[["precision", "recall", "f1"]]
+            for name, sweep in sweeps.items()
+        }
+        best = {name: sweep.best_f1() for name, sweep in sweeps.items()}
+        return sweeps, curves, best
+
+    # Follow-up workload comes from the precomputed catalog scores, when they have been built
+    @st.cache_resource
+    def get_catalog(path, mtime):
+        return CatalogReader(path)
+
+    sweeps, sweep_curves, sweep_best = get_threshold_sweeps()
+    if sweeps:
+        st.subheader("🎚️ Decision Threshold")
+        st.markdown(
+            "A lower threshold finds more confirmed planets (recall) at the cost of more false alarms "
+            "(precision). Metrics are on the calibrated probabilities the demo below uses; the threshold "
+            "chosen here is applied to the single-row and batch predictions."
+        )
+
+        tune_model = st.selectbox("Model to tune", list(sweeps))
+        slider_key = f"threshold_{tune_model}"
+        if slider_key not in st.session_state:
+            st.session_state[slider_key] = float(st.session_state.thresholds.get(tune_model, DEFAULT_THRESHOLD))
+        threshold = st.slider("Threshold on P(CONFIRMED)", 0.0, 1.0, step=0.01, key=slider_key)
+        st.session_state.thresholds[tune_model] = threshold
+
+        sweep = sweeps[tune_model]
+        with span("research.threshold_lookup"):
+            at = sweep.at(threshold)
+            baseline = sweep.at(DEFAULT_THRESHOLD)
+
+        m1, m2, m3, m4 = st.columns(4)
+        for col, label, key in [(m1, "Precision", "precision"), (m2, "Recall", "recall"), (m3, "F1", "f1")]:
+            col.metric(label, f"{at[key]:.3f}", f"{at[key] - baseline[key]:+.3f} vs {DEFAULT_THRESHOLD}")
+        m4.metric("Flagged CONFIRMED (test)", f"{at['flagged']} / {sweep.n}", f"{at['flagged'] - baseline['flagged']:+d}")
+
+        if os.path.exists(CATALOG_DB_PATH):
+            catalog = get_catalog(CATALOG_DB_PATH, os.path.getmtime(CATALOG_DB_PATH))
+            if tune_model in catalog.models:
+                _, flagged = catalog.page(tune_model, dispositions=["CANDIDATE"], min_prob=threshold, limit=0)
+                st.markdown(
+                    f"**Follow-up workload:** {flagged} catalog CANDIDATEs score at or above {threshold:.2f}; "
+                    f"at the test precision about {flagged * at['precision']:.0f} of them would be expected to confirm "
+                    f"and {flagged * (1 - at['precision']):.0f} to be false alarms."
+                )
+
+        st.line_chart(sweep_curves[tune_model])
+
+        best = sweep_best[tune_model]
+        st.caption(f"Best test F1 for {tune_model}: {best['f1']:.3f} at threshold {best['threshold']:.3f}.")
+        if st.button("💾 Save as default threshold"):
+            save_threshold(tune_model, threshold)
+            st.success(f"Saved {threshold:.2f} as the default threshold for {tune_model}.")
+
+    st.divider()
+
+
 # ---------- DEMO SECTION ----------
 st.header("🚀 Try the Model (Interactive Demo)")
 st.title("🔭 Exoplanet Classifier using our trained models")
@@ -267,11 +443,15 @@ FEATURE_RANGES = {
 }
 
  
-# Initialize session state for feature values 
-if "feature_values" not in st.session_state: 
-    st.session_state.feature_values = { 
-        k: float((v[0] + v[1]) / 2.0) for k, v in FEATURE_RANGES.items() 
-    } 
+FEATURE_NAMES = list(FEATURE_RANGES)
+FEATURE_COLUMNS = [NAME_MAP.get(name, name) for name in FEATURE_NAMES]  # fall back to same if not found
+
+# Feature values: one float array in FEATURE_RANGES order, kept in this session's
+# app-owned values (session_store) so it outlives the input_* widgets' own state,
+# which Streamlit drops once the user leaves the page
+session = session_values("research")
+if "feature_array" not in session: 
+    session["feature_array"] = np.array([(lo + hi) / 2.0 for lo, hi in FEATURE_RANGES.values()])
  
 # Utility functions 
 def random_value_between(key): 
@@ -279,31 +459,51 @@ def random_value_between(key):
     return float(np.random.uniform(lo, hi)) 
  
 def assign_random(feature): 
-    st.session_state.feature_values[feature] = random_value_between(feature) 
+    session["feature_array"][FEATURE_NAMES.index(feature)] = random_value_between(feature) 
  
 def assign_random_all(): 
-    for k in FEATURE_RANGES.keys(): 
-        st.session_state.feature_values[k] = random_value_between(k) 
+    session["feature_array"][:] = [random_value_between(k) for k in FEATURE_NAMES]
  
 # Dropdown to select the model
-model_choice = st.selectbox("🧠 Select Model", ["CatBoost", "LightGBM"])
-
-# Load selected model
-
-model = None
-
-model_paths = {
-    "CatBoost": "catboost.pkl",
-    "LightGBM": "lightgbm.pkl"
-}
-
-selected_model_path = model_paths.get(model_choice)
+model_choice = st.selectbox("🧠 Select Model", list(MODEL_PATHS) + [ENSEMBLE_NAME])
+threshold = st.session_state.thresholds.get(model_choice, DEFAULT_THRESHOLD)
+st.caption(f"Decision threshold: P(CONFIRMED) ≥ {threshold:.2f} (tune it under Model Evaluation)")
+
+# Load models once per process; the ensemble reuses the same objects.
+# Probabilities go through the isotonic tables fitted in the training notebook.
+@st.cache_resource
+def get_models():
+    with span("research.joblib_load"):
+        return calibrate_models(load_models(), load_calibration())
+
+# With EXOBOOST_INFERENCE_URL set, scoring is delegated to the shared inference workers
+INFERENCE_URL = os.environ.get("EXOBOOST_INFERENCE_URL")
+
+# One client per model and process, so every session reuses its keep-alive connections
+@st.cache_resource
+def get_remote_model(choice):
+    return RemoteClassifier(INFERENCE_URL, choice)
+
+if INFERENCE_URL:
+    model = get_remote_model(model_choice)
+    missing_paths = []
+elif model_choice == ENSEMBLE_NAME:
+    models = get_models()
+    model = build_ensemble(models)
+    missing = [name for name in MODEL_PATHS if name not in models]
+    missing_paths = [MODEL_PATHS[name] for name in missing]
+else:
+    models = get_models()
+    model = models.get(model_choice)
+    missing_paths = [] if model is not None else [MODEL_PATHS[model_choice]]
 
-if os.path.exists(selected_model_path):
-    model = joblib.load(selected_model_path)
+if INFERENCE_URL:
+    st.success(f"✅ Using {model_choice} from the inference workers at {INFERENCE_URL}.")
+elif model is not None:
     st.success(f"✅ Loaded {model_choice} model successfully.")
 else:
-    st.error(f"❌ Could not find `{selected_model_path}`. Please make sure the file exists.")
+    for path in missing_paths:
+        st.error(f"❌ Could not find `{path}`. Please make sure the file exists.")
     st.write("📂 Current working directory:", os.getcwd())
  
 # Input grid 
@@ -317,62 +517,251 @@ for i, (feat, (lo, hi)) in enumerate(FEATURE_RANGES.items()):
     
     val = col.number_input( 
         label=feat, 
-        value=float(st.session_state.feature_values.get(feat, (lo + hi) / 2.0)), 
+        value=float(session["feature_array"][i]), 
         format="%.6g", 
         key=f"input_{feat}", 
     ) 
  
     # Save immediately 
-    st.session_state.feature_values[feat] = float(val) 
- 
-    # Validation with clear range message
-    if val < lo or val > hi: 
-        col.error(f"⚠️ **{feat}** is out of valid range: [{lo:.6g}, {hi:.6g}]")
+    session["feature_array"][i] = float(val) 
  
  
 # Prepare DataFrame for model 
-X_dict = {} 
-for pretty_name, value in st.session_state.feature_values.items(): 
-    raw_name = NAME_MAP.get(pretty_name, pretty_name)  # fall back to same if not found 
-    X_dict[raw_name] = [float(value)] 
- 
-X_df = pd.DataFrame.from_dict(X_dict) 
+with span("research.build_dataframe"):
+    X_df = pd.DataFrame([session["feature_array"]], columns=FEATURE_COLUMNS)
+
+# Validate against the clip bounds fitted in preprocess_inputs (same check as batch scoring)
+@st.cache_resource
+def get_validator():
+    prep = load_preprocessing()
+    return InputValidator(prep) if prep is not None else None
+
+validator = get_validator()
+PRETTY_NAMES = {raw: pretty for pretty, raw in NAME_MAP.items()}
+
+range_mode = st.radio(
+    "Out-of-range inputs",
+    ["Clip to training bounds", "Reject"],
+    horizontal=True,
+    help="Bounds are the 3×IQR clip limits used during training, in scaled units.",
+)
+input_rejected = False
+
+if validator is not None:
+    mode = "reject" if range_mode == "Reject" else "clip"
+    with span("research.validate"):
+        X_valid, report = validator.validate(X_df, mode=mode)
+    for r in report.itertuples():
+        st.error(
+            f"⚠️ **{PRETTY_NAMES.get(r.feature, r.feature)}** = {r.value:.6g} is out of valid range: "
+            f"[{r.lower:.6g}, {r.upper:.6g}] (≈ {r.raw_value:.6g} in catalog units)"
+        )
+    if len(report) and mode == "reject":
+        input_rejected = True
+        st.warning("🚫 Input rejected: fix the values above or switch to clipping.")
+    else:
+        X_df = X_valid
+else:
+    st.warning(f"⚠️ `{PREPROCESSING_PATH}` not found, inputs are sent to the model unchecked.")
  
 st.subheader("📊 Input Preview (Model Input)") 
 st.dataframe(X_df, use_container_width=True) 
  
 # Predict
 
-if model is not None and st.button("🚀 Predict"):
+# One cache per process, shared by every session
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(maxsize=4096, ttl=3600.0, decimals=4)
+
+@st.cache_resource
+def get_local_model_version(choice):
+    return model_version(choice)
+
+def get_model_version(choice):
+    """Cache-key version: reported by the inference workers in remote mode, else hashed from local files"""
+    if INFERENCE_URL:
+        return get_remote_model(choice).version()
+    return get_local_model_version(choice)
+
+def run_prediction(model, X_df):
+    """CONFIRMED probability and (for the ensemble) member probabilities.
+
+    The label is left out so cached entries stay valid when the threshold changes.
+    """
+    p, members = proba_and_members(model, X_df)
+    return {
+        "prob": float(p[0]),
+        "members": {name: float(q[0]) for name, q in members.items()} if members else None,
+    }
+
+prediction_cache = get_prediction_cache()
+
+if model is not None and st.button("🚀 Predict", disabled=input_rejected):
     try:
         # Align features if needed
-        if hasattr(model, "feature_names_"):
-            expected_features = model.feature_names_
-            X_df = X_df.reindex(columns=expected_features)
-        elif hasattr(model, "get_booster") and hasattr(model.get_booster(), "feature_name"):
-            expected_features = model.get_booster().feature_name()
-            X_df = X_df.reindex(columns=expected_features, fill_value=0)
-
-        # Make prediction
-        preds = model.predict(X_df)
-
-        # Get probability (if available)
-        if hasattr(model, "predict_proba"):
-            probs = model.predict_proba(X_df)
-
-            # Find probability of predicted class
-            if hasattr(model, "classes_"):
-                class_idx = list(model.classes_).index(preds[0])
-                pred_prob = float(probs[0, class_idx])
-            else:
-                pred_prob = float(probs[0, 1]) if probs.shape[1] > 1 else float(probs[0, 0])
-
-            # Display as percentage
-            st.success(f"✅ Prediction: {preds[0]} ({pred_prob * 100:.2f}%)")
-        else:
-            st.success(f"✅ Prediction: {preds[0]} (probability unavailable)")
+        X_df = align_features(model, X_df)
+
+        # Score the quantized vector so a cached entry is exact for every input that maps to it
+        cache_key = prediction_cache.key(get_model_version(model_choice), X_df.to_numpy()[0])
+        result = prediction_cache.get(cache_key)
+        from_cache = result is not None
+        if result is None:
+            X_df = pd.DataFrame(
+                [quantize(X_df.to_numpy()[0], prediction_cache.decimals)], columns=X_df.columns
+            )
+            with span("research.predict_proba"):
+                result = run_prediction(model, X_df)
+            prediction_cache.put(cache_key, result)
+
+        # Display as percentage of the predicted class
+        pred = predicted_labels(result["prob"], threshold).item()
+        prob = result["prob"] if pred == "CONFIRMED" else 1.0 - result["prob"]
+        st.success(f"✅ Prediction: {pred} ({prob * 100:.2f}%)")
+
+        if result["members"]:
+            st.caption(" | ".join(
+                f"{name}: {p * 100:.2f}% CONFIRMED" for name, p in result["members"].items()
+            ))
+
+        stats = prediction_cache.stats()
+        st.caption(
+            f"{'⚡ Served from cache' if from_cache else '🧮 Scored by model'} · "
+            f"cache hits {stats['hits']} / misses {stats['misses']} "
+            f"({stats['hit_rate'] * 100:.0f}% hit rate, {stats['size']}/{stats['maxsize']} entries)"
+        )
 
     except Exception as e:
         st.error(f"❌ Prediction failed: {str(e)}")
 
 
+# ---------- WHAT-IF SWEEP ----------
+# Separate from the prediction cache: entries are whole grids, keyed by model, swept features and base vector
+@st.cache_resource
+def get_whatif_cache():
+    return PredictionCache(maxsize=256, ttl=3600.0, decimals=4)
+
+st.header("🧪 What-if Sweep")
+st.markdown(
+    "Vary one or two inputs across their range while every other input stays at the values above. "
+    "The whole grid is scored in one batched prediction, once you switch the sweep on."
+)
+
+# Opt-in: otherwise every edit above would score a whole grid (a network request in remote mode)
+run_whatif = st.checkbox("Run the what-if sweep", value=False)
+if run_whatif and model is not None and not input_rejected:
+    w1, w2, w3 = st.columns([2, 2, 1])
+    x_feature = w1.selectbox("Feature to vary", list(FEATURE_RANGES))
+    y_feature = w2.selectbox("Second feature (heatmap)", ["None"] + [f for f in FEATURE_RANGES if f != x_feature])
+    points = w3.select_slider("Grid points per feature", [10, 25, 50, 100, 200], value=50)
+
+    swept = [x_feature] + ([y_feature] if y_feature != "None" else [])
+    axes = grid_axes({NAME_MAP[f]: FEATURE_RANGES[f] for f in swept}, points, validator)
+    # Sweep around the quantized base vector so a cached grid is exact for every input that maps to it
+    whatif_cache = get_whatif_cache()
+    base = align_features(model, X_df)
+    base = pd.DataFrame([quantize(base.to_numpy()[0], whatif_cache.decimals)], columns=base.columns)
+    whatif_key = whatif_cache.key(f"{get_model_version(model_choice)}|{','.join(axes)}|{points}", base.to_numpy()[0])
+    p_grid = whatif_cache.get(whatif_key)
+    if p_grid is None:
+        try:
+            with span("research.whatif_predict_proba"):
+                p_grid = sweep_grid(model, base, axes)
+            whatif_cache.put(whatif_key, p_grid)
+        except Exception as e:
+            st.error(f"❌ What-if sweep failed: {str(e)}")
+
+    if p_grid is not None:
+        if len(swept) == 1:
+            st.line_chart(
+                pd.DataFrame({x_feature: axes[NAME_MAP[x_feature]], "P(CONFIRMED)": p_grid, "Threshold": threshold}),
+                x=x_feature, y=["P(CONFIRMED)", "Threshold"],
+            )
+        else:
+            st.vega_lite_chart(heatmap_frame(axes, p_grid), {
+                "mark": "rect",
+                "encoding": {
+                    "x": {"field": "x", "type": "quantitative", "bin": {"binned": True}, "title": x_feature},
+                    "x2": {"field": "x2"},
+                    "y": {"field": "y", "type": "quantitative", "bin": {"binned": True}, "title": y_feature},
+                    "y2": {"field": "y2"},
+                    "color": {"field": "p", "type": "quantitative", "title": "P(CONFIRMED)",
+                              "scale": {"domain": [0, 1], "scheme": "viridis"}},
+                    "tooltip": [{"field": "p", "type": "quantitative", "format": ".3f", "title": "P(CONFIRMED)"}],
+                },
+            }, use_container_width=True)
+        st.caption(
+            f"{p_grid.size} grid points · P(CONFIRMED) from {p_grid.min():.3f} to {p_grid.max():.3f} · "
+            "ranges limited to the training clip bounds"
+        )
+
+
+# ---------- SIMILAR PLANETS ----------
+# Memory-mapped, so every session (and the User page) shares one copy of the index
+@st.cache_resource
+def get_similarity_index():
+    with span("research.similarity_load"):
+        return load_index()
+
+st.header("🔎 Similar Known Planets")
+similarity_index = get_similarity_index()
+
+if similarity_index is None:
+    st.info(
+        f"`{SIMILARITY_INDEX_PATH}` not found. Build it with "
+        "`python StreamlitApp/exoboost.py build-index` to see the closest catalog objects."
+    )
+elif not input_rejected:
+    n_neighbours = st.slider("Number of neighbours", 1, 25, 5)
+    with span("research.similarity_query"):
+        neighbours = similar_planets(similarity_index, X_df, k=n_neighbours)[0]
+    st.dataframe(
+        neighbours.rename(columns={**PRETTY_NAMES, "koi_steff": "Stellar Effective Temp (K)"}),
+        use_container_width=True,
+        hide_index=True,
+    )
+    st.caption("Distances are in the standardized model feature space; catalog columns are in physical units.")
+
+
+# ---------- BATCH PREDICTION ----------
+st.header("📂 Batch Prediction")
+st.markdown(
+    "Upload a CSV of scaled feature rows (model column names or the display names above). "
+    "Rows go through the same validation as the single-row form."
+)
+
+uploaded = st.file_uploader("Feature CSV", type=["csv"])
+
+if uploaded is not None and model is not None and validator is not None:
+    batch_df = pd.read_csv(uploaded).rename(columns=NAME_MAP)
+    mode = "reject" if range_mode == "Reject" else "clip"
+    with span("research.batch_validate"):
+        X_batch, batch_report = validator.validate(batch_df, mode=mode)
+
+    rejected_rows = batch_report["row"].nunique()
+    st.write(
+        f"**{len(batch_df)}** rows · **{rejected_rows}** with out-of-range values "
+        f"({'dropped' if mode == 'reject' else 'clipped'})"
+    )
+    if len(batch_report):
+        with st.expander("Rejected-row report"):
+            st.dataframe(batch_report, use_container_width=True)
+
+    if len(X_batch):
+        with span("research.batch_predict_proba"):
+            p = positive_proba(model, X_batch)
+        scored = batch_df.loc[X_batch.index].copy()
+        scored["prob_confirmed"] = p
+        scored["prediction"] = predicted_labels(p, threshold)
+        st.dataframe(scored, use_container_width=True)
+        st.download_button(
+            label="📥 Download predictions",
+            data=scored.to_csv(index=False).encode(),
+            file_name="exoboost_predictions.csv",
+            mime="text/csv",
+        )
+
+# -------------------------------
+# Tracing & Profiling
+# -------------------------------
+finish_page_run("research", run_started)
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
 import os
 from PIL import Image
 import base64
@@ -9,8 +8,17 @@ import random
 import requests
 import io
 
+from tracing import span, start_page_run, finish_page_run
+from session_store import image_cache, session_values
+from similarity import load_index, similar_planets
+
 # Page styling
 st.set_page_config(page_title="🪐 Exoplanet Explorer", page_icon="🪐", layout="centered")
+
+# -------------------------------
+# Tracing & Profiling
+# -------------------------------
+run_started = start_page_run()
 # -------------------------------
 # Local Background Image (Base64 Method)
 # -------------------------------
@@ -23,7 +31,8 @@ def get_base64_of_bin_file(bin_file):
     return base64.b64encode(data).decode()
 
 if os.path.exists(bg_image_path):
-    bin_str = get_base64_of_bin_file(bg_image_path)
+    with span("user.background_b64"):
+        bin_str = get_base64_of_bin_file(bg_image_path)
     page_bg = f"""
     <style>
     [data-testid="stAppViewContainer"] {{
@@ -411,13 +420,45 @@ Technical details visible: planet illumination intensity {light_intensity:.2%},
     
     return prompt
 
+# Shared, memory-mapped nearest-neighbour index over the KOI catalog
+@st.cache_resource
+def get_similarity_index():
+    with span("user.similarity_load"):
+        return load_index()
+
+# Answers are kept as one small int array (option index per question, -1 = not answered yet)
+QUESTION_KEYS = list(QUESTION_CLUSTERS)
+
+def no_answers():
+    return np.full(len(QUESTION_KEYS), -1, dtype=np.int8)
+
+def decode_answers(codes):
+    """{question key: chosen option} for the answered questions"""
+    return {
+        q_key: list(QUESTION_CLUSTERS[q_key]['options'])[code]
+        for q_key, code in zip(QUESTION_KEYS, codes) if code >= 0
+    }
+
+# The generated planet is drawn once per answer set and kept as a float array in
+# FEATURE_RANGES order (NaN = not set by any question), so reruns such as
+# Generate Image show the same planet and the same real neighbours
+FEATURE_NAMES = list(FEATURE_RANGES)
+
+def encode_features(features):
+    return np.array([features.get(name, np.nan) for name in FEATURE_NAMES])
+
+def decode_features(values):
+    return {name: float(v) for name, v in zip(FEATURE_NAMES, values) if not np.isnan(v)}
+
 # Initialize session state
 if 'page' not in st.session_state:
     st.session_state.page = 'intro'
-if 'answers' not in st.session_state:
-    st.session_state.answers = {}
+if 'answer_codes' not in st.session_state:
+    st.session_state.answer_codes = no_answers()
 if 'child_name' not in st.session_state:
     st.session_state.child_name = ""
+# The planet's feature array and image key are app-owned (session_store), dropped when the session goes idle
+session = session_values("user")
 
 
 
@@ -486,24 +527,25 @@ elif st.session_state.page == 'questions':
     
     st.markdown("Answer these 7 questions to create your unique planet!")
     
-    progress = len(st.session_state.answers) / len(QUESTION_CLUSTERS)
+    progress = np.count_nonzero(st.session_state.answer_codes >= 0) / len(QUESTION_CLUSTERS)
     st.progress(progress)
     
     # Display all questions
-    for q_key, q_data in QUESTION_CLUSTERS.items():
+    for i, (q_key, q_data) in enumerate(QUESTION_CLUSTERS.items()):
         st.markdown(f"### {q_data['question']}")
         
+        options = list(q_data['options'].keys())
         answer = st.radio(
             "Choose one:",
-            options=list(q_data['options'].keys()),
+            options=options,
             key=f"radio_{q_key}",
-            index=list(q_data['options'].keys()).index(st.session_state.answers.get(q_key, list(q_data['options'].keys())[0]))
+            index=max(int(st.session_state.answer_codes[i]), 0)
         )
         
-        st.session_state.answers[q_key] = answer
+        st.session_state.answer_codes[i] = options.index(answer)
         st.markdown("---")
     
-    if len(st.session_state.answers) == len(QUESTION_CLUSTERS):
+    if np.all(st.session_state.answer_codes >= 0):
         if st.button("🚀 Create My Exoplanet! 🚀"):
             st.session_state.page = 'result'
             st.rerun()
@@ -513,12 +555,18 @@ elif st.session_state.page == 'result':
     st.title(f"🎉 Amazing! Here's {st.session_state.child_name}'s Exoplanet! 🎉")
     
     st.balloons()
-    
-    # Generate feature values
-    features = generate_feature_values(st.session_state.answers)
-    
+    answers = decode_answers(st.session_state.answer_codes)
+    
+    # Generate feature values (only for a new answer set)
+    answer_key = st.session_state.answer_codes.tobytes()
+    if session.get("features_for") != answer_key:
+        with span("user.generate_features"):
+            session["planet_features"] = encode_features(generate_feature_values(answers))
+        session["features_for"] = answer_key
+    features = decode_features(session["planet_features"])
+
     # Generate image prompt with features
-    image_prompt = generate_image_prompt(st.session_state.answers, st.session_state.child_name, features)
+    image_prompt = generate_image_prompt(answers, st.session_state.child_name, features)
     
     st.markdown("### 🖼️ Your Planet Description:")
     
@@ -526,54 +574,68 @@ elif st.session_state.page == 'result':
     st.info(f"""
     **{st.session_state.child_name}'s Exoplanet** is a magnificent world!
     
-    🪐 **Size:** {QUESTION_CLUSTERS['size']['options'][st.session_state.answers['size']]['desc']}
+    🪐 **Size:** {QUESTION_CLUSTERS['size']['options'][answers['size']]['desc']}
     
-    🌡️ **Temperature:** {QUESTION_CLUSTERS['temperature']['options'][st.session_state.answers['temperature']]['desc']}
+    🌡️ **Temperature:** {QUESTION_CLUSTERS['temperature']['options'][answers['temperature']]['desc']}
     
-    🌍 **Year Length:** {QUESTION_CLUSTERS['orbit']['options'][st.session_state.answers['orbit']]['desc']}
+    🌍 **Year Length:** {QUESTION_CLUSTERS['orbit']['options'][answers['orbit']]['desc']}
     
-    ⭐ **Star Type:** {QUESTION_CLUSTERS['star_type']['options'][st.session_state.answers['star_type']]['desc']}
+    ⭐ **Star Type:** {QUESTION_CLUSTERS['star_type']['options'][answers['star_type']]['desc']}
     
-    🎈 **Gravity:** {QUESTION_CLUSTERS['gravity']['options'][st.session_state.answers['gravity']]['desc']}
+    🎈 **Gravity:** {QUESTION_CLUSTERS['gravity']['options'][answers['gravity']]['desc']}
     
-    💨 **Atmosphere:** {QUESTION_CLUSTERS['atmosphere']['options'][st.session_state.answers['atmosphere']]['desc']}
+    💨 **Atmosphere:** {QUESTION_CLUSTERS['atmosphere']['options'][answers['atmosphere']]['desc']}
     
-    🔭 **Location:** {QUESTION_CLUSTERS['location']['options'][st.session_state.answers['location']]['desc']}
+    🔭 **Location:** {QUESTION_CLUSTERS['location']['options'][answers['location']]['desc']}
     """)
     
+    # Real catalog planets closest to the generated features
+    similarity_index = get_similarity_index()
+    if similarity_index is not None:
+        X_user = pd.DataFrame([{NAME_MAP[name]: value for name, value in features.items()}])
+        with span("user.similarity_query"):
+            neighbours = similar_planets(similarity_index, X_user, k=10)[0]
+        neighbours = neighbours[neighbours["disposition"] != "FALSE POSITIVE"].head(3)
+
+        st.markdown("### 🔭 Real Planets Like Yours:")
+        for row in neighbours.itertuples():
+            kind = "a confirmed planet" if row.disposition == "CONFIRMED" else "a planet candidate"
+            # Catalog values can be missing (no radius fit, for example); leave those facts out
+            facts = []
+            if not np.isnan(row.koi_period):
+                facts.append(f"a year there lasts **{row.koi_period:.0f} days**")
+            if not np.isnan(row.koi_prad):
+                facts.append(f"it is **{row.koi_prad:.1f}×** the size of Earth 🌍")
+            st.markdown(f"- **{row.name}** is {kind}" + (": " + " and ".join(facts) if facts else ""))
+
     # st.markdown("### 🎨 Fictional Visual for Your Planet:")
     # st.code(image_prompt, language="text")
-    API_TOKEN = ""  # <-- Put your API key here
-    MODEL_URL = "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0"
+    API_TOKEN = os.environ.get("EXOBOOST_IMAGE_API_TOKEN", "")  # <-- Put your API key here
+    MODEL_URL = os.environ.get(
+        "EXOBOOST_IMAGE_API_URL",
+        "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0",
+    )
     OUTPUT_FILE = "generated_planet.png"
 
     if st.button("Generate Image"):
             with st.spinner("🎨 Generating image... this may take a few seconds"):
                 headers = {"Authorization": f"Bearer {API_TOKEN}"}
                 try:
-                    response = requests.post(
-                        MODEL_URL,
-                        headers=headers,
-                        json={"inputs": image_prompt},
-                        timeout=120
-                    )
+                    with span("user.image_api"):
+                        response = requests.post(
+                            MODEL_URL,
+                            headers=headers,
+                            json={"inputs": image_prompt},
+                            timeout=120
+                        )
 
                     if response.status_code == 200:
-                        image = Image.open(io.BytesIO(response.content))
-                        st.image(image, caption="Generated Image")
-
-                        # Save and download
-                        image.save(OUTPUT_FILE)
-                        img_byte_arr = io.BytesIO()
-                        image.save(img_byte_arr, format="PNG")
-                        img_byte_arr.seek(0)
-                        st.download_button(
-                            label="📥 Download Image",
-                            data=img_byte_arr,
-                            file_name=OUTPUT_FILE,
-                            mime="image/png"
-                        )
-                        st.success(f"✅ Image saved as {OUTPUT_FILE}")
+                        with span("user.image_decode"):
+                            image = Image.open(io.BytesIO(response.content))
+                            png = io.BytesIO()
+                            image.save(png, format="PNG")
+                        # The PNG lives once in the shared image store; the session only keeps its key
+                        session["image_key"] = image_cache().put(png.getvalue())
                     elif response.status_code == 503:
                         st.warning("⏳ Model is loading... please try again in a few seconds.")
                     else:
@@ -581,6 +643,19 @@ elif st.session_state.page == 'result':
 
                 except Exception as e:
                     st.error(f"❌ Exception: {str(e)}")
+
+    if session.get("image_key"):
+        image_bytes = image_cache().get(session["image_key"])
+        if image_bytes is None:
+            st.info("🖼️ Your picture was cleared to make room for other explorers' planets. Press **Generate Image** to paint it again!")
+        else:
+            st.image(image_bytes, caption="Generated Image")
+            st.download_button(
+                label="📥 Download Image",
+                data=image_bytes,
+                file_name=OUTPUT_FILE,
+                mime="image/png"
+            )
         
     # st.markdown("### 📊 NASA KOI Dataset Features Generated:")
     # st.write(f"**Total Features Generated:** {len(features)} out of 34")
@@ -594,14 +669,22 @@ elif st.session_state.page == 'result':
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🔄 Create Another Planet"):
-            st.session_state.answers = {}
+            st.session_state.answer_codes = no_answers()
+            session.pop("image_key", None)
+            session.pop("features_for", None)
             st.session_state.page = 'questions'
             st.rerun()
     
     with col2:
         if st.button("🏠 Start Over"):
-            st.session_state.answers = {}
+            st.session_state.answer_codes = no_answers()
+            session.pop("image_key", None)
+            session.pop("features_for", None)
             st.session_state.child_name = ""
             st.session_state.page = 'intro'
             st.rerun()
 
+# -------------------------------
+# Tracing & Profiling
+# -------------------------------
+finish_page_run("user", run_started)
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def file_digest(path, length=12):
+    """Short content hash of a file, or 'missing' if it does not exist"""
+    if not os.path.exists(path):
+        return "missing"
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:length]
+
+
+def quantize(features, decimals):
+    """Round a feature vector so near-identical inputs share one cache entry"""
+    q = np.round(np.asarray(features, dtype=np.float64), decimals)
+    return q + 0.0  # folds -0.0 into 0.0 so both hash the same
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with a per-entry TTL, shared by every session in the process"""
+
+    def __init__(self, maxsize=4096, ttl=3600.0, decimals=4):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, model_version, features):
+        """Hash of the model version plus the aligned, quantized feature vector"""
+        q = quantize(features, self.decimals)
+        h = hashlib.sha1(model_version.encode())
+        h.update(q.tobytes())
+        return h.hexdigest()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or now - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,101 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+PREPROCESSING_PATH = "Models/preprocessing.json"
+
+
+def load_preprocessing(path=PREPROCESSING_PATH):
+    """Load the clip bounds, medians and scaler parameters fitted by preprocess_inputs"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+class InputValidator:
+    """Vectorized range checks against the training IQR clip bounds (in scaled units)"""
+
+    def __init__(self, prep):
+        self.features = list(prep["features"])
+        self.lower = np.asarray(prep["scaled_lower"], dtype=float)
+        self.upper = np.asarray(prep["scaled_upper"], dtype=float)
+        self.center = np.asarray(prep["scaler_center"], dtype=float)
+        self.scale = np.asarray(prep["scaler_scale"], dtype=float)
+
+    def to_array(self, X_df):
+        """Feature matrix in training column order (missing columns become NaN)"""
+        return X_df.reindex(columns=self.features).to_numpy(dtype=float)
+
+    def out_of_range(self, X):
+        """Boolean mask of cells below/above the bounds; NaN counts as out of range"""
+        return ~((X >= self.lower) & (X <= self.upper))
+
+    def report(self, X_df):
+        """One row per out-of-range cell, with the raw-unit value for reference"""
+        X = self.to_array(X_df)
+        return self._report(X, self.out_of_range(X), X_df.index)
+
+    def _report(self, X, bad, index):
+        rows, cols = np.nonzero(bad)
+        values = X[rows, cols]
+        return pd.DataFrame({
+            "row": index.to_numpy()[rows],
+            "feature": np.asarray(self.features)[cols],
+            "value": values,
+            "lower": self.lower[cols],
+            "upper": self.upper[cols],
+            "raw_value": values * self.scale[cols] + self.center[cols],
+        })
+
+    def validate(self, X_df, mode="clip"):
+        """Validated batch plus rejected-row report.
+
+        mode="clip" clips every row into bounds; mode="reject" drops rows with any
+        out-of-range cell. The report lists the offending cells either way.
+        """
+        X = self.to_array(X_df)
+        bad = self.out_of_range(X)
+        report = self._report(X, bad, X_df.index)
+        if mode == "reject":
+            keep = ~bad.any(axis=1)
+            return pd.DataFrame(X[keep], index=X_df.index[keep], columns=self.features), report
+        # Scaled 0 is the training median (RobustScaler centers on it)
+        X = np.clip(np.nan_to_num(X, nan=0.0), self.lower, self.upper)
+        return pd.DataFrame(X, index=X_df.index, columns=self.features), report
+
+
+def transform_raw(df, prep):
+    """Scaled model features for raw cumulative.csv-schema rows, computed as preprocess_inputs does"""
+    raw = df.reindex(columns=prep["raw_columns"]).to_numpy(dtype=float)
+    return pd.DataFrame(transform_array(raw, prep), index=df.index, columns=prep["features"], copy=False)
+
+
+def transform_array(raw, prep):
+    """transform_raw on a float matrix already in prep["raw_columns"] order"""
+    raw_columns = prep["raw_columns"]
+    bounds = prep["clip_bounds"]
+    lower = np.array([bounds[c][0] if c in bounds else -np.inf for c in raw_columns])
+    upper = np.array([bounds[c][1] if c in bounds else np.inf for c in raw_columns])
+    medians = np.array([prep["medians"][c] for c in raw_columns])
+
+    # IQR clip, then median fill (np.clip keeps NaN, so the fill sees only missing cells)
+    raw = np.clip(raw, lower, upper)
+    raw = np.where(np.isnan(raw), medians, raw)
+
+    col = {c: raw[:, i] for i, c in enumerate(raw_columns)}
+    engineered = {
+        "depth_to_srad": col["koi_depth"] / (col["koi_srad"] + 1e-10),
+        "prad_to_srad_ratio": col["koi_prad"] / (col["koi_srad"] + 1e-10),
+        "period_to_impact": col["koi_period"] / (col["koi_impact"] + 1e-10),
+        "log_insol": np.log1p(col["koi_insol"]),
+        "log_snr": np.log1p(col["koi_model_snr"]),
+    }
+
+    # One gather over a contiguous matrix; stacking strided column views is several times slower on large batches
+    names = list(raw_columns) + list(engineered)
+    full = np.hstack([raw, np.column_stack(list(engineered.values()))])
+    X = np.take(full, [names.index(f) for f in prep["features"]], axis=1)
+    return (X - np.asarray(prep["scaler_center"])) / np.asarray(prep["scaler_scale"])
@@ -0,0 +1,125 @@
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from inference import POSITIVE_CLASS, positive_proba
+from preprocessing import transform_raw
+
+# -------------------------------
+# Incremental (warm-start) retraining of the boosted models.
+#
+# New labeled KOI rows are transformed with the fitted preprocessing statistics
+# (no refit of the clip bounds, medians or scaler, so the app's inputs stay
+# valid), and a few extra boosting rounds are added on top of the current model.
+# A candidate only replaces the live model if it does at least as well on the
+# holdout: the notebook's original test split plus a slice of the new rows.
+# -------------------------------
+
+BASE_DATASET = "Dataset/cumulative.csv"
+LABELS = ["CANDIDATE", "CONFIRMED"]
+
+
+def labeled_rows(df):
+    """CANDIDATE / CONFIRMED rows only, as in preprocess_inputs"""
+    return df[df["koi_disposition"].isin(LABELS)].reset_index(drop=True)
+
+
+def base_split(prep, path=BASE_DATASET):
+    """The notebook's train/test split of the base catalog, in scaled features"""
+    data = labeled_rows(pd.read_csv(path))
+    X = transform_raw(data, prep)
+    y = data["koi_disposition"]
+    return train_test_split(X, y, train_size=0.7, shuffle=True, random_state=1, stratify=y)
+
+
+def split_new_rows(new, base_path, prep, holdout_fraction, seed=0):
+    """Scaled train / holdout parts of the rows not already in the base catalog"""
+    new = labeled_rows(new)
+    if "kepoi_name" in new.columns:
+        known = set(pd.read_csv(base_path, usecols=["kepoi_name"])["kepoi_name"])
+        new = new[~new["kepoi_name"].isin(known)].reset_index(drop=True)
+    X = transform_raw(new, prep)
+    y = new["koi_disposition"]
+    if holdout_fraction <= 0 or len(new) < 10:
+        return X, X.iloc[:0], y, y.iloc[:0]
+    return train_test_split(X, y, test_size=holdout_fraction, shuffle=True, random_state=seed,
+                            stratify=y if y.value_counts().min() > 1 else None)
+
+
+def tree_count(model):
+    if hasattr(model, "tree_count_"):
+        return int(model.tree_count_)
+    return int(model.booster_.num_trees())
+
+
+def warm_start(model, X, y, rounds):
+    """Copy of `model` boosted for `rounds` more iterations on (X, y)"""
+    if hasattr(model, "tree_count_"):
+        from catboost import CatBoostClassifier
+
+        # Keep the original step size; CatBoost would otherwise pick one for `rounds` iterations.
+        # No training logs: CatBoost would write a catboost_info/ directory into the working directory.
+        params = {**model.get_params(), "iterations": rounds, "learning_rate": model.learning_rate_,
+                  "allow_writing_files": False}
+        candidate = CatBoostClassifier(**params)
+        candidate.fit(X, y, init_model=model)
+    else:
+        from lightgbm import LGBMClassifier
+
+        candidate = LGBMClassifier(**{**model.get_params(), "n_estimators": rounds, "verbose": -1})
+        candidate.fit(X, y, init_model=model.booster_)
+    return candidate
+
+
+def holdout_metrics(model, X, y):
+    """ROC-AUC, log loss and accuracy of the CONFIRMED probability on one holdout"""
+    if len(y) == 0 or y.nunique() < 2:
+        return None
+    p = positive_proba(model, X)
+    truth = (y == POSITIVE_CLASS).to_numpy()
+    return {
+        "roc_auc": float(roc_auc_score(truth, p)),
+        "log_loss": float(log_loss(truth, np.clip(p, 1e-7, 1 - 1e-7))),
+        "accuracy": float(accuracy_score(truth, p >= 0.5)),
+    }
+
+
+def retrain_model(name, model, train, holdouts, rounds, min_delta=0.0):
+    """Warm-start one model and compare it with the incumbent on every holdout.
+
+    `holdouts` maps a label to (X, y); the gate uses the "combined" entry.
+    """
+    X, y = train
+    started = time.perf_counter()
+    candidate = warm_start(model, X, y, rounds)
+    elapsed = time.perf_counter() - started
+
+    metrics = {
+        label: {"current": holdout_metrics(model, Xh, yh), "candidate": holdout_metrics(candidate, Xh, yh)}
+        for label, (Xh, yh) in holdouts.items()
+    }
+    combined = metrics["combined"]
+    promote = combined["candidate"]["roc_auc"] >= combined["current"]["roc_auc"] + min_delta
+    return candidate, {
+        "model": name,
+        "trees": [tree_count(model), tree_count(candidate)],
+        "seconds": elapsed,
+        "metrics": metrics,
+        "promote": bool(promote),
+    }
+
+
+def promote_model(path, candidate, archive_dir="Models"):
+    """Replace the live model file, keeping the previous one next to the other artifacts"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    tmp = path + ".tmp"
+    joblib.dump(candidate, tmp)
+    if os.path.exists(path):
+        shutil.copy2(path, os.path.join(archive_dir, f"{stem}_previous.pkl"))
+    os.replace(tmp, path)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# -------------------------------
+# Per-session memory accounting and shared storage for bulky session data.
+#
+# Large byte strings such as generated images are stored once per process in
+# a byte-bounded LRU and referenced by content hash. The per-session values the
+# app owns (image keys, feature arrays) live here too, in one dict per session
+# id rather than in st.session_state, so the Diagnostics page can show bytes per
+# session and sessions left idle for SESSION_IDLE_TTL seconds (an open tab
+# nobody uses, or one that was closed) can be dropped without reaching into
+# Streamlit's state. Widget values stay with Streamlit and are not counted.
+# -------------------------------
+
+SESSION_IDLE_TTL = float(os.environ.get("EXOBOOST_SESSION_IDLE_TTL", 1800))
+IMAGE_CACHE_BYTES = int(float(os.environ.get("EXOBOOST_IMAGE_CACHE_MB", 64)) * 2**20)
+
+
+def sizeof(value):
+    """Approximate bytes held by a session-state value (arrays and frames by their buffers)"""
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.flags.owndata else value.nbytes)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def process_rss():
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource  # Unix only; /proc covers Linux
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ByteCache:
+    """Thread-safe LRU of byte strings keyed by content hash, bounded by their total size"""
+
+    def __init__(self, max_bytes=IMAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, data):
+        """Store `data` and return its key; identical content is stored once"""
+        key = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return key
+            if len(data) > self.max_bytes:
+                return key  # never fits; get() will report it as gone
+            self._data[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, old = self._data.popitem(last=False)
+                self._bytes -= len(old)
+                self.evictions += 1
+        return key
+
+    def get(self, key):
+        """The stored bytes, or None once they have been evicted"""
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+            return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class SessionRegistry:
+    """App-owned values of every session that has run a page in this process, keyed by session id.
+
+    Evicting a session drops its dict under this registry's lock; the session's
+    own script only ever holds a reference to it, so nothing else is mutated.
+    """
+
+    def __init__(self, idle_ttl=SESSION_IDLE_TTL, sweep_every=60.0):
+        self.idle_ttl = idle_ttl
+        self.sweep_every = sweep_every
+        self.evictions = 0
+        self._last_sweep = 0.0
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def values(self, session_id, page):
+        """The dict of `session_id`'s values, created empty on first use (or after eviction)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = self._sessions[session_id] = {"values": {}}
+            entry.update(page=page, last_seen=now)
+            due = now - self._last_sweep >= self.sweep_every
+            if due:
+                self._last_sweep = now
+        if due:
+            self.evict_idle(now)
+        return entry["values"]
+
+    def evict_idle(self, now=None):
+        """Forget sessions idle past the TTL, closed ones included; they start over on their next run"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [sid for sid, entry in self._sessions.items() if now - entry["last_seen"] >= self.idle_ttl]
+            for session_id in idle:
+                del self._sessions[session_id]
+            self.evictions += len(idle)
+
+    def stats(self):
+        """One row per known session, most recently active first"""
+        now = time.monotonic()
+        with self._lock:
+            entries = [(sid, entry["page"], entry["last_seen"], list(entry["values"].items()))
+                       for sid, entry in self._sessions.items()]
+        rows = [
+            {
+                "session": session_id[:8],
+                "page": page,
+                "idle_s": round(now - last_seen, 1),
+                "keys": len(items),
+                "bytes": sum(sizeof(k) + sizeof(v) for k, v in items),
+            }
+            for session_id, page, last_seen, items in entries
+        ]
+        return sorted(rows, key=lambda r: r["idle_s"])
+
+
+_IMAGE_CACHE = ByteCache()
+_REGISTRY = SessionRegistry()
+
+
+def image_cache():
+    """The process-wide image store shared by every session"""
+    return _IMAGE_CACHE
+
+
+def session_registry():
+    return _REGISTRY
+
+
+def session_values(page):
+    """The current session's app-owned values (a plain dict); call once per page run"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return {}
+    return _REGISTRY.values(ctx.session_id, page)
+
+
+def track_session(page):
+    """Record that the current session ran `page`, for pages that keep no values here"""
+    session_values(page)
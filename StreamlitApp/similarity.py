@@ -0,0 +1,91 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# "Similar known planets": nearest neighbours over the KOI catalog.
+#
+# The index lives in one joblib file whose arrays (tree nodes, points and the
+# display columns) are stored uncompressed, so loading with mmap_mode="r" maps
+# them instead of reading them: every process shares the same page-cache copy
+# and only the nodes a query touches are ever paged in.
+# -------------------------------
+
+SIMILARITY_INDEX_PATH = "Models/similarity_index.joblib"
+
+# Columns shown next to each neighbour (catalog units)
+DISPLAY_COLUMNS = ["koi_period", "koi_prad", "koi_teq", "koi_steff"]
+
+
+def index_space(X, space):
+    """Map scaled model features into the distance space of the index.
+
+    The engineered ratios have tails many orders of magnitude above the other
+    features, so every feature is clipped to its 1st-99th percentile and
+    standardized; otherwise a single ratio would decide every neighbour.
+    """
+    X = np.clip(np.asarray(X, dtype=float), space["lower"], space["upper"])
+    return (X - space["mean"]) / space["std"]
+
+
+def build_index(catalog, X, features, leaf_size=40):
+    """Index over scaled features `X` of the rows of `catalog` (KOI schema with object_id / mission)"""
+    from sklearn.neighbors import KDTree
+
+    X = np.asarray(X, dtype=float)
+    lower, upper = np.percentile(X, [1, 99], axis=0)
+    clipped = np.clip(X, lower, upper)
+    space = {"lower": lower, "upper": upper, "mean": clipped.mean(axis=0), "std": clipped.std(axis=0)}
+    space["std"][space["std"] == 0] = 1.0
+
+    def text(values):
+        # Fixed-width unicode keeps the column a plain ndarray, so it memory-maps too
+        return np.asarray(pd.Series(values).fillna("").astype(str).to_numpy(), dtype="U")
+
+    names = catalog["kepler_name"].where(catalog["kepler_name"].notna(), catalog["object_id"])
+    columns = {
+        "object_id": text(catalog["object_id"]),
+        "name": text(names),
+        "mission": text(catalog["mission"]),
+        "disposition": text(catalog["koi_disposition"]),
+    }
+    for c in DISPLAY_COLUMNS:
+        columns[c] = catalog[c].to_numpy(dtype=float)
+
+    return {
+        "features": list(features),
+        "tree": KDTree(index_space(X, space), leaf_size=leaf_size),
+        "space": space,
+        "columns": columns,
+    }
+
+
+def save_index(index, path=SIMILARITY_INDEX_PATH):
+    tmp = path + ".tmp"
+    joblib.dump(index, tmp)  # no compression, or mmap_mode cannot map the arrays
+    os.replace(tmp, path)
+
+
+def load_index(path=SIMILARITY_INDEX_PATH):
+    """Memory-mapped index, or None if it has not been built"""
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path, mmap_mode="r")
+
+
+def similar_planets(index, X, k=5, exclude_self=False):
+    """The k nearest catalog rows to each scaled feature row of `X`, one frame per row"""
+    if isinstance(X, pd.DataFrame):
+        X = X.reindex(columns=index["features"])
+    Xq = index_space(X, index["space"])
+    dist, ind = index["tree"].query(Xq, k=k + int(exclude_self))
+    results = []
+    for d, i in zip(dist, ind):
+        if exclude_self:
+            d, i = d[1:], i[1:]
+        frame = pd.DataFrame({name: col[i] for name, col in index["columns"].items()})
+        frame.insert(0, "distance", d)
+        results.append(frame)
+    return results
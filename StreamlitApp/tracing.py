@@ -0,0 +1,209 @@
+import bisect
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+except ImportError:  # optional, falls back to cProfile
+    _PyinstrumentProfiler = None
+
+logger = logging.getLogger("exoboost.trace")
+
+# EXOBOOST_TRACE_LOG=1 (or "stderr") logs spans to stderr; any other value is a file path
+_TRACE_LOG = os.environ.get("EXOBOOST_TRACE_LOG")
+if _TRACE_LOG and not logger.handlers:
+    _handler = logging.StreamHandler() if _TRACE_LOG in ("1", "stderr") else logging.FileHandler(_TRACE_LOG)
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(process)d %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_LOCK = threading.Lock()
+_HISTOGRAMS = {}
+_SERVER = None
+
+
+class Histogram:
+    """Cumulative latency histogram for one span name"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Bucket upper bound that covers the q-th fraction of observations"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+def record(name, seconds):
+    """Add one observation to the process-wide histogram for `name`"""
+    with _LOCK:
+        hist = _HISTOGRAMS.get(name)
+        if hist is None:
+            hist = _HISTOGRAMS[name] = Histogram()
+        hist.observe(seconds)
+    if _TRACE_LOG:
+        logger.info("span=%s seconds=%.6f", name, seconds)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block and record it under `name`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def snapshot():
+    """Summary rows (count, mean and p50/p95/p99 bucket bounds) for every span"""
+    with _LOCK:
+        rows = []
+        for name, hist in sorted(_HISTOGRAMS.items()):
+            rows.append({
+                "span": name,
+                "count": hist.count,
+                "mean_s": hist.total / hist.count if hist.count else 0.0,
+                "p50_s": hist.quantile(0.50),
+                "p95_s": hist.quantile(0.95),
+                "p99_s": hist.quantile(0.99),
+            })
+        return rows
+
+
+def render_prometheus():
+    """All span histograms in the Prometheus text exposition format"""
+    lines = [
+        "# HELP exoboost_span_seconds Time spent in instrumented app stages.",
+        "# TYPE exoboost_span_seconds histogram",
+    ]
+    with _LOCK:
+        for name, hist in sorted(_HISTOGRAMS.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), hist.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'exoboost_span_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'exoboost_span_seconds_sum{{span="{name}"}} {hist.total:.6f}')
+            lines.append(f'exoboost_span_seconds_count{{span="{name}"}} {hist.count}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=None, host=None):
+    """Serve /metrics on EXOBOOST_METRICS_PORT (once per process); no-op when unset.
+
+    Binds to loopback unless EXOBOOST_METRICS_HOST says otherwise (e.g. 0.0.0.0 for a remote scraper).
+    """
+    global _SERVER
+    port = port or os.environ.get("EXOBOOST_METRICS_PORT")
+    if not port:
+        return None
+    host = host or os.environ.get("EXOBOOST_METRICS_HOST", "127.0.0.1")
+    with _LOCK:
+        if _SERVER is None:
+            _SERVER = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_SERVER.serve_forever, name="exoboost-metrics", daemon=True).start()
+    return _SERVER
+
+
+def start_profiler():
+    """Start a pyinstrument profiler if installed, otherwise cProfile.
+
+    Returns None when another profiler already owns the interpreter
+    (Python 3.12+ allows a single cProfile at a time).
+    """
+    try:
+        if _PyinstrumentProfiler is not None:
+            profiler = _PyinstrumentProfiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+    except (RuntimeError, ValueError):
+        return None
+    return profiler
+
+
+def stop_profiler(profiler, limit=25):
+    """Stop the profiler and return a plain-text report"""
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+    profiler.stop()
+    return profiler.output_text(unicode=True, color=False)
+
+
+# -------------------------------
+# Streamlit page runs
+# -------------------------------
+def start_page_run():
+    """Metrics server, sidebar profiler toggle and run timer; call at the top of a page script.
+
+    Returns the start time to hand to finish_page_run.
+    """
+    import streamlit as st  # only pages need it; the CLI and inference workers import this module too
+
+    start_metrics_server()
+    started = time.perf_counter()
+    # A run cut short by st.rerun() never reaches finish_page_run, so stop its profiler here
+    if st.session_state.get("_profiler") is not None:
+        stop_profiler(st.session_state.pop("_profiler"))
+    st.session_state.profile_enabled = st.sidebar.toggle(
+        "⏱️ Profile this session", value=st.session_state.get("profile_enabled", False)
+    )
+    if st.session_state.profile_enabled:
+        st.session_state._profiler = start_profiler()
+    return started
+
+
+def finish_page_run(name, started):
+    """Record `<name>.script_run` and show this run's profile, if one was taken"""
+    import streamlit as st
+
+    record(f"{name}.script_run", time.perf_counter() - started)
+    if st.session_state.get("_profiler") is not None:
+        with st.sidebar.expander("⏱️ Profile of this run"):
+            st.code(stop_profiler(st.session_state.pop("_profiler")), language="text")
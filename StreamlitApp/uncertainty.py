@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from inference import DEFAULT_THRESHOLD, positive_proba
+from preprocessing import transform_array
+
+# -------------------------------
+# Monte Carlo propagation of the catalog's measurement uncertainties.
+#
+# Each measured quantity comes with asymmetric 1-sigma error bars in
+# <column>_err1 (upper, >= 0) and <column>_err2 (lower, <= 0). Every row is
+# redrawn `n_samples` times from a split normal around its catalog value, the
+# draws go through the same preprocessing as real rows, and each block of draws
+# is scored in one batched call. Only per-row summaries are kept, so memory is
+# bounded by `batch_rows` whatever the number of samples.
+# -------------------------------
+
+# Measured quantities that carry an _err1 / _err2 pair in the KOI schema
+MEASURED_COLUMNS = [
+    "koi_period", "koi_time0bk", "koi_impact", "koi_duration", "koi_depth", "koi_prad",
+    "koi_teq", "koi_insol", "koi_steff", "koi_slogg", "koi_srad",
+]
+
+# Physical quantities that cannot be negative; draws below zero are clipped to zero
+NON_NEGATIVE = {
+    "koi_period", "koi_impact", "koi_duration", "koi_depth", "koi_prad",
+    "koi_teq", "koi_insol", "koi_steff", "koi_srad",
+}
+
+SUMMARY_COLUMNS = ["mc_mean", "mc_std", "mc_p05", "mc_p50", "mc_p95", "mc_confirmed_frac"]
+
+
+def split_normal_draws(values, err_upper, err_lower, n_samples, rng):
+    """(n_rows, n_samples) draws: half above the value with sigma err1, half below with sigma |err2|.
+
+    A missing error bar means no spread on that side; a missing value stays missing.
+    """
+    z = rng.standard_normal((len(values), n_samples))
+    sigma = np.where(z >= 0, err_upper[:, None], np.abs(err_lower)[:, None])
+    return values[:, None] + z * np.nan_to_num(sigma)
+
+
+def perturbed_rows(koi, raw_columns, n_samples, rng, columns=MEASURED_COLUMNS):
+    """Raw matrix (raw_columns order) of `koi` repeated n_samples times per row, measured columns redrawn.
+
+    Rows are row-major: the first n_samples rows are draws of koi's first row.
+    Error columns are repeated unchanged: they are model inputs in their own right.
+    """
+    samples = np.repeat(koi.reindex(columns=raw_columns).to_numpy(dtype=float), n_samples, axis=0)
+    for c in columns:
+        if c not in raw_columns or f"{c}_err1" not in koi.columns or f"{c}_err2" not in koi.columns:
+            continue
+        draws = split_normal_draws(
+            koi[c].to_numpy(dtype=float),
+            koi[f"{c}_err1"].to_numpy(dtype=float),
+            koi[f"{c}_err2"].to_numpy(dtype=float),
+            n_samples, rng,
+        )
+        if c in NON_NEGATIVE:
+            draws = np.maximum(draws, 0.0)
+        samples[:, raw_columns.index(c)] = draws.ravel()
+    return samples
+
+
+def summarize(p, threshold=DEFAULT_THRESHOLD):
+    """Per-row summary of an (n_rows, n_samples) probability matrix"""
+    p05, p50, p95 = np.percentile(p, [5, 50, 95], axis=1)
+    return {
+        "mc_mean": p.mean(axis=1),
+        "mc_std": p.std(axis=1),
+        "mc_p05": p05,
+        "mc_p50": p50,
+        "mc_p95": p95,
+        "mc_confirmed_frac": (p >= threshold).mean(axis=1),
+    }
+
+
+def monte_carlo(model, koi, prep, n_samples=1000, rng=None, batch_rows=200_000, threshold=DEFAULT_THRESHOLD):
+    """Distribution of P(CONFIRMED) under the error bars, summarized per row of `koi` (KOI schema).
+
+    Rows are processed in blocks of about `batch_rows` draws; each block is one
+    preprocessing pass over a plain float matrix and one predict_proba call.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    raw_columns = list(prep["raw_columns"])
+    out = {c: np.empty(len(koi)) for c in SUMMARY_COLUMNS}
+    rows_per_batch = max(1, batch_rows // n_samples)
+    for start in range(0, len(koi), rows_per_batch):
+        block = koi.iloc[start:start + rows_per_batch]
+        X = transform_array(perturbed_rows(block, raw_columns, n_samples, rng), prep)
+        X = pd.DataFrame(X, columns=prep["features"], copy=False)  # wrap, don't copy, the fresh matrix
+        p = positive_proba(model, X).reshape(len(block), n_samples)
+        for c, values in summarize(p, threshold).items():
+            out[c][start:start + len(block)] = values
+    return pd.DataFrame(out, index=koi.index)
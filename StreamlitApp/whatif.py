@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from inference import positive_proba
+
+# -------------------------------
+# What-if sweeps: P(CONFIRMED) as one or two inputs vary, the rest held fixed.
+#
+# The whole grid is built as one frame and scored with a single predict_proba
+# call, so a 50 x 50 heatmap costs one batched prediction instead of 2,500
+# script reruns.
+# -------------------------------
+
+
+def grid_axes(ranges, points, validator=None):
+    """Evenly spaced values for each swept column ({column: (lo, hi)}).
+
+    With a validator, each range is narrowed to the training clip bounds so every
+    grid point is an input the single-row form would accept unchanged.
+    """
+    axes = {}
+    for column, (lo, hi) in ranges.items():
+        if validator is not None and column in validator.features:
+            j = validator.features.index(column)
+            lo, hi = max(lo, validator.lower[j]), min(hi, validator.upper[j])
+        axes[column] = np.linspace(lo, hi, points)
+    return axes
+
+
+def feature_grid(base, axes):
+    """The one-row frame `base` repeated over the Cartesian product of `axes`"""
+    mesh = np.meshgrid(*axes.values(), indexing="ij")
+    grid = pd.DataFrame(np.repeat(base.to_numpy(dtype=float), mesh[0].size, axis=0), columns=base.columns)
+    for column, values in zip(axes, mesh):
+        grid[column] = values.ravel()
+    return grid
+
+
+def sweep_grid(model, base, axes):
+    """CONFIRMED probability at every grid point, shaped (len(axis 1)[, len(axis 2)])"""
+    p = positive_proba(model, feature_grid(base, axes))
+    return p.reshape([len(values) for values in axes.values()])
+
+
+def heatmap_frame(axes, p):
+    """Long-format cells (x..x2, y..y2, p) of a two-feature sweep, for a Vega-Lite rect chart"""
+    (x, y) = axes.values()
+    dx = (x[1] - x[0]) / 2 if len(x) > 1 else 0.5
+    dy = (y[1] - y[0]) / 2 if len(y) > 1 else 0.5
+    xx, yy = np.meshgrid(x, y, indexing="ij")
+    return pd.DataFrame({
+        "x": (xx - dx).ravel(), "x2": (xx + dx).ravel(),
+        "y": (yy - dy).ravel(), "y2": (yy + dy).ravel(),
+        "p": p.ravel(),
+    })